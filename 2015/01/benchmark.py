@@ -0,0 +1,58 @@
+"""Benchmarks for Day 1: Not Quite Lisp.
+
+Run from this directory with: python benchmark.py
+
+"""
+import os
+import time
+
+from solution import get_basement_position_bytes, get_basement_position_parallel
+
+
+def measure_time(function, *args):
+    """Measures the time a function takes.
+
+    Parameters
+    ----------
+    function : function
+        The function to measure.
+
+    *args
+        The arguments of the function.
+
+    Returns
+    -------
+    result
+        The value returned by the function.
+
+    elapsed : float
+        The amount of seconds the function took.
+    """
+    start_time = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start_time
+
+    return result, elapsed
+
+
+if __name__ == "__main__":
+    # Instructions that stay next to the ground floor and only enter the
+    # basement at the very end, so every instruction must be followed.
+    size = 20000000
+    data = b"()" * (size // 2) + b"))"
+
+    print("--- Basement search over {} instructions ---".format(len(data)))
+    expected, sequential = measure_time(get_basement_position_bytes, data)
+    print("Sequential: {:.2f}s".format(sequential))
+
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        position, elapsed = measure_time(
+            get_basement_position_parallel, data, workers
+        )
+        assert position == expected
+
+        print(
+            "{} workers: {:.2f}s ({:.2f}x)".format(
+                workers, elapsed, sequential / elapsed
+            )
+        )
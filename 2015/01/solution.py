@@ -40,6 +40,22 @@ What is the position of the character that causes Santa to first enter the
 basement?
 
 """
+import argparse
+import operator
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, count
+
+# The valid instructions.
+INSTRUCTIONS = b"()"
+
+# Translation of the instructions into steps: "(" becomes 2 and ")" becomes 0,
+# so the sum of the first j steps minus j is the floor after them.
+STEP_TABLE = bytes.maketrans(b"()", b"\x02\x00")
+
+# Amount of instructions the basement search checks at once.
+BLOCK_SIZE = 65536
 
 
 def get_floor(instruction_str):
@@ -120,20 +136,565 @@ def get_basement_position(instruction_str):
     return 0
 
 
+def find_invalid_instruction(data):
+    """Returns the index of the first invalid character in the instructions.
+
+    Parameters
+    ----------
+    data : bytes
+        The instructions that determine to which floor Santa must go.
+
+    Return
+    ------
+    index : int
+        The index of the first character different from "(" or ")", or -1 if
+        every character is valid.
+    """
+    # Remove every valid character, keeping the invalid ones in order.
+    invalid = data.translate(None, INSTRUCTIONS)
+
+    if len(invalid) == 0:
+        return -1
+
+    # The first occurrence of the first invalid character is the first invalid
+    # character.
+    return data.find(invalid[:1])
+
+
+def find_basement_offset(data, floor=0, start=0, stop=None):
+    """Returns the index of the first instruction that moves Santa to the
+    basement.
+
+    The instructions are checked in blocks. A block is skipped when even all of
+    its ")" at once cannot move Santa to the basement; otherwise the floors in
+    the block are computed as a cumulative sum of its steps and the first one
+    at the basement is searched for.
+
+    Parameters
+    ----------
+    data : bytes
+        The instructions, with only "(" and ")" between start and stop.
+
+    floor : int
+        The floor, not below the ground floor, Santa is at before start.
+
+    start : int
+        The index of the first instruction to follow.
+
+    stop : int or None
+        The index where the instructions end (not included), or None to follow
+        them until the end of data.
+
+    Return
+    ------
+    index : int
+        The index of the first instruction that moves Santa to the basement, or
+        -1 if Santa never enters it.
+    """
+    if stop is None:
+        stop = len(data)
+
+    i = start
+    while i < stop:
+        end = min(i + BLOCK_SIZE, stop)
+        down = data.count(b")", i, end)
+
+        if floor - down < 0:
+            # The floor after the j-th step of the block, plus one, is the sum
+            # of the steps minus (j - floor). As Santa moves one floor at a
+            # time, he first enters the basement where it is zero.
+            steps = data[i:end].translate(STEP_TABLE)
+            floors = map(operator.sub, accumulate(steps), count(-floor))
+
+            try:
+                return i + operator.indexOf(floors, 0)
+            except ValueError:
+                pass
+
+        floor += data.count(b"(", i, end) - down
+        i = end
+
+    return -1
+
+
+def get_floor_bytes(data):
+    """Returns the floor Santa must get to, following the instructions in bulk.
+
+    Parameters
+    ----------
+    data : bytes
+        The instructions that determine to which floor Santa must go.
+
+    Return
+    ------
+    floor : int or None
+        The floor Santa must go, or None if an invalid character was found on
+        the instructions.
+    """
+    # If you find a char different from "(" or ")", return None.
+    if len(data.translate(None, INSTRUCTIONS)) > 0:
+        return None
+
+    return data.count(b"(") - data.count(b")")
+
+
+def get_basement_position_bytes(data):
+    """Returns the first char index that moves Santa to the basement, following
+    the instructions in bulk.
+
+    Parameters
+    ----------
+    data : bytes
+        The instructions that determine to which floor Santa must go.
+
+    Return
+    ------
+    index : int or None
+        The first char index that moves Santa to the basement, 0 if Santa
+        never entered the basement, or None an invalid character was found.
+    """
+    # Only the instructions before the first invalid character are followed.
+    invalid = find_invalid_instruction(data)
+    stop = invalid if invalid >= 0 else len(data)
+
+    offset = find_basement_offset(data, 0, 0, stop)
+
+    # Positions start at 1.
+    if offset >= 0:
+        return offset + 1
+    elif invalid >= 0:
+        return None
+    else:
+        return 0
+
+
+def follow_instructions_stream(instruction_file, chunk_size=1048576):
+    """Follows each line of instructions of a file, reading it in chunks.
+
+    Only one chunk is held in memory at a time; the floor and the basement
+    search of the current line are carried from one chunk to the next. Each
+    line is stripped of its leading and trailing ASCII whitespace.
+
+    Parameters
+    ----------
+    instruction_file : file or mmap
+        The binary file with the instructions, one line per set of
+        instructions.
+
+    chunk_size : int
+        The amount of bytes read at a time.
+
+    Yields
+    ------
+    floor : int or None
+        The floor Santa must go, or None if an invalid character was found on
+        the line.
+
+    index : int or None
+        The first char index that moves Santa to the basement, 0 if Santa
+        never entered the basement, or None an invalid character was found.
+    """
+    # State of the current line: the floor, the basement position, the amount
+    # of instructions followed, and whether an invalid character was found.
+    floor = 0
+    position = 0
+    followed = 0
+    invalid = False
+
+    # Whether the line has any byte, and any non-whitespace byte.
+    has_bytes = False
+    has_content = False
+
+    # Whitespace held back until it is known whether it ends the line.
+    pending = b""
+
+    def follow(segment, end_of_line):
+        """Follows a segment of the current line."""
+        nonlocal floor, position, followed, invalid, has_content, pending
+
+        # Strip the whitespace at the start of the line.
+        if not has_content:
+            segment = segment.lstrip()
+
+            if len(segment) == 0:
+                return
+
+            has_content = True
+
+        # Hold back the whitespace at the end of the segment, as it may be at
+        # the end of the line.
+        segment = pending + segment
+        stripped = segment.rstrip()
+        pending = b"" if end_of_line else segment[len(stripped) :]
+        segment = stripped
+
+        if invalid:
+            return
+
+        # Only the instructions before an invalid character are followed.
+        bad = find_invalid_instruction(segment)
+        stop = bad if bad >= 0 else len(segment)
+
+        if position == 0:
+            offset = find_basement_offset(segment, floor, 0, stop)
+
+            if offset >= 0:
+                position = followed + offset + 1
+
+        floor += segment.count(b"(", 0, stop) - segment.count(b")", 0, stop)
+        followed += stop
+
+        if bad >= 0:
+            invalid = True
+
+    def finish():
+        """Returns the result of the current line and resets the state."""
+        nonlocal floor, position, followed, invalid, has_bytes, has_content
+        nonlocal pending
+
+        if invalid:
+            result = (None, position if position > 0 else None)
+        else:
+            result = (floor, position)
+
+        floor = 0
+        position = 0
+        followed = 0
+        invalid = False
+        has_bytes = False
+        has_content = False
+        pending = b""
+
+        return result
+
+    for chunk in iter(lambda: instruction_file.read(chunk_size), b""):
+        lines = chunk.split(b"\n")
+
+        # Every segment but the last one ends its line.
+        for segment in lines[:-1]:
+            follow(segment, True)
+            yield finish()
+
+        if len(lines[-1]) > 0:
+            has_bytes = True
+            follow(lines[-1], False)
+
+    # The last line may not end with a breakline.
+    if has_bytes:
+        follow(b"", True)
+        yield finish()
+
+
+def summarize_instructions(data, floor=None):
+    """Summarizes a chunk of instructions for the parallel basement search.
+
+    The chunk is followed in blocks like in find_basement_offset, and only the
+    blocks whose ")" at once could go below the lowest floor change reached so
+    far are followed step by step.
+
+    Parameters
+    ----------
+    data : bytes
+        The chunk of instructions.
+
+    floor : int or None
+        The floor Santa is at before the chunk, or None if it is not known yet.
+        When it is known, the chunk is only followed until Santa enters the
+        basement.
+
+    Return
+    ------
+    net : int
+        The floor change after following the instructions of the chunk, or of
+        the instructions up to the basement if Santa enters it.
+
+    lowest : int
+        The lowest floor change reached inside the chunk, 0 if it is never
+        below the starting floor.
+
+    position : int
+        The index of the first instruction that moves Santa to the basement, or
+        -1 if the floor is not known or Santa never enters it.
+
+    invalid : int
+        The index of the first invalid character, or -1 if every character is
+        valid. Only the instructions before it are summarized.
+    """
+    invalid = find_invalid_instruction(data)
+    stop = invalid if invalid >= 0 else len(data)
+
+    # The lowest floor change that would move Santa to the basement.
+    bound = -floor if floor is not None else None
+
+    net = 0
+    lowest = 0
+
+    i = 0
+    while i < stop:
+        end = min(i + BLOCK_SIZE, stop)
+        down = data.count(b")", i, end)
+
+        if net - down < lowest:
+            # The floor change after the j-th step of the block is the sum of
+            # the steps minus (j - net).
+            steps = data[i:end].translate(STEP_TABLE)
+            floors = map(operator.sub, accumulate(steps), count(1 - net))
+            lowest = min(lowest, min(floors))
+
+            if bound is not None and lowest < bound:
+                # Santa enters the basement inside this block.
+                position = find_basement_offset(data, floor + net, i, end)
+                return net, lowest, position, invalid
+
+        net += (end - i) - 2 * down
+        i = end
+
+    return net, lowest, -1, invalid
+
+
+def get_basement_position_parallel(data, workers=None, num_chunks=None):
+    """Returns the first char index that moves Santa to the basement, searching
+    the instructions with a pool of processes.
+
+    Each worker summarizes a chunk of the instructions. Combining the summaries
+    in order finds the chunk where Santa first enters the basement, and only
+    that chunk is followed again to find the exact position. The first chunk
+    starts at the ground floor, so its worker finds the position directly, and
+    the search stops without waiting for the other chunks if it is there.
+
+    Parameters
+    ----------
+    data : bytes
+        The instructions that determine to which floor Santa must go.
+
+    workers : int or None
+        The amount of worker processes, or None to use every available core.
+
+    num_chunks : int or None
+        The amount of chunks the instructions are split into, or None to use
+        one per worker.
+
+    Return
+    ------
+    index : int or None
+        The first char index that moves Santa to the basement, 0 if Santa
+        never entered the basement, or None an invalid character was found.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if num_chunks is None:
+        num_chunks = workers
+
+    # Split the instructions into chunks of about the same size.
+    chunk_size = max(1, -(-len(data) // num_chunks))
+    starts = range(0, len(data), chunk_size)
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            pool.submit(
+                summarize_instructions,
+                data[start : start + chunk_size],
+                0 if start == 0 else None,
+            )
+            for start in starts
+        ]
+
+        # Follow the summaries in order from the ground floor.
+        floor = 0
+        for start, future in zip(starts, futures):
+            net, lowest, position, invalid = future.result()
+
+            if position >= 0:
+                return start + position + 1
+
+            if floor + lowest < 0:
+                # Santa enters the basement inside this chunk.
+                stop = start + invalid if invalid >= 0 else start + chunk_size
+                stop = min(stop, len(data))
+
+                return find_basement_offset(data, floor, start, stop) + 1
+
+            if invalid >= 0:
+                return None
+
+            floor += net
+    finally:
+        # Do not wait for the chunks past the one with the answer.
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    # If Santa never entered the basement, return 0.
+    return 0
+
+
+class FloorIndex:
+    """Index of the floors Santa goes through following a set of instructions.
+
+    The index is built in a single pass and answers the floor after any step
+    and the first step at any floor in constant time. More instructions can be
+    appended without rebuilding it.
+
+    Parameters
+    ----------
+    instructions : str or bytes
+        The instructions that determine to which floor Santa must go.
+
+    Attributes
+    ----------
+    floors : array of int
+        The floor after each step, starting with the ground floor at step 0.
+
+    first_up : array of int
+        The first step at each floor, starting with the ground floor.
+
+    first_down : array of int
+        The first step at each basement level, starting with floor -1.
+    """
+
+    def __init__(self, instructions=""):
+        self.floors = array("q", [0])
+        self.first_up = array("q", [0])
+        self.first_down = array("q")
+
+        self.append(instructions)
+
+    def __len__(self):
+        """Returns the amount of instructions followed."""
+        return len(self.floors) - 1
+
+    def append(self, instructions):
+        """Follows more instructions, extending the index.
+
+        Parameters
+        ----------
+        instructions : str or bytes
+            The instructions that determine to which floor Santa must go.
+
+        Raises
+        ------
+        ValueError
+            If an invalid character is found on the instructions.
+        """
+        if isinstance(instructions, str):
+            instructions = bytes(instructions, "utf-8")
+
+        invalid = find_invalid_instruction(instructions)
+        if invalid >= 0:
+            raise ValueError(
+                "Invalid instruction at position {}".format(len(self) + invalid + 1)
+            )
+
+        # Step and floor where the new instructions start.
+        previous = len(self)
+        floor = self.floors[-1]
+
+        # The floor after the j-th new step is the starting floor plus the sum
+        # of the first j steps minus j.
+        steps = instructions.translate(STEP_TABLE)
+        self.floors.extend(map(operator.sub, accumulate(steps), count(1 - floor)))
+
+        # Santa moves one floor at a time, so each floor not reached before is
+        # first reached after the floor next to it.
+        while True:
+            floor = len(self.first_up)
+            start = max(self.first_up[-1], previous)
+
+            try:
+                self.first_up.append(self.floors.index(floor, start))
+            except ValueError:
+                break
+
+        while True:
+            floor = -len(self.first_down) - 1
+            start = max(self.first_down[-1], previous) if self.first_down else previous
+
+            try:
+                self.first_down.append(self.floors.index(floor, start))
+            except ValueError:
+                break
+
+    def floor_at(self, step):
+        """Returns the floor Santa is at after a step.
+
+        Parameters
+        ----------
+        step : int
+            The amount of instructions followed.
+
+        Returns
+        -------
+        floor : int
+            The floor Santa is at.
+        """
+        return self.floors[step]
+
+    def first_step_at(self, floor):
+        """Returns the first step that takes Santa to a floor.
+
+        Parameters
+        ----------
+        floor : int
+            The floor.
+
+        Returns
+        -------
+        step : int or None
+            The first step that takes Santa to the floor, 0 for the ground
+            floor, or None if Santa never goes to the floor.
+        """
+        if floor >= 0:
+            first_steps, i = self.first_up, floor
+        else:
+            first_steps, i = self.first_down, -floor - 1
+
+        return first_steps[i] if i < len(first_steps) else None
+
+    def basement_position(self):
+        """Returns the first char index that moves Santa to the basement.
+
+        Returns
+        -------
+        index : int
+            The first char index that moves Santa to the basement, or 0 if
+            Santa never entered the basement.
+        """
+        step = self.first_step_at(-1)
+
+        return step if step is not None else 0
+
+
 if __name__ == "__main__":
-    # Read the input file, and process each line.
-    input_file = open("input.txt", "r")
-    inputs = input_file.readlines()
+    parser = argparse.ArgumentParser(description="Day 1: Not Quite Lisp")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read the instructions in chunks instead of loading the whole file",
+    )
+    args = parser.parse_args()
+
+    if args.stream:
+        # Follow each line of the input file while reading it.
+        with open("input.txt", "rb") as input_file:
+            results = list(follow_instructions_stream(input_file))
+    else:
+        # Read the input file, and process each line.
+        input_file = open("input.txt", "r")
+        inputs = input_file.readlines()
+
+        results = []
+        for i in inputs:
+            # Remove the stripline.
+            instruction = i.strip()
+
+            results.append(
+                (get_floor(instruction), get_basement_position(instruction))
+            )
 
     # First part of the puzzle.
     print("--- First Part ---")
 
-    for i in inputs:
-        # Remove the stripline.
-        instruction = i.strip()
-
-        floor = get_floor(instruction)
-
+    for floor, _ in results:
         if floor is not None:
             print("Floor: ", floor)
         else:
@@ -142,12 +703,7 @@ if __name__ == "__main__":
     # First part of the puzzle.
     print("--- Second Part ---")
 
-    for i in inputs:
-        # Remove the stripline.
-        instruction = i.strip()
-
-        pos = get_basement_position(instruction)
-
+    for _, pos in results:
         if pos > 0:
             print("Position: ", pos)
         elif pos == 0:
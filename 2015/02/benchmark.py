@@ -0,0 +1,198 @@
+"""Benchmarks for Day 2: I Was Told There Would Be No Math.
+
+Run from this directory with: python benchmark.py {columnar,sharded}
+
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from array import array
+
+from solution import (
+    get_paper_amount,
+    get_ribbon_amount,
+    get_total_amounts_columnar,
+    get_total_amounts_sharded,
+    load_dimensions_file,
+    sort_dimensions,
+)
+
+
+def generate_columns(num_presents, seed=0):
+    """Generates random dimensions for the presents.
+
+    Parameters
+    ----------
+    num_presents : int
+        The amount of presents.
+
+    seed : int
+        The seed of the random generator.
+
+    Returns
+    -------
+    lengths : array of int
+        The length of each present.
+
+    widths : array of int
+        The width of each present.
+
+    heights : array of int
+        The height of each present.
+    """
+    rng = random.Random(seed)
+
+    return tuple(
+        array("q", (rng.randint(1, 30) for _ in range(num_presents)))
+        for _ in range(3)
+    )
+
+
+def get_total_amounts_scalar(lengths, widths, heights):
+    """Determine the total amount of wrapping paper and ribbon needed, one
+    present at a time.
+
+    Parameters
+    ----------
+    lengths : array of int
+        The length of each present.
+
+    widths : array of int
+        The width of each present.
+
+    heights : array of int
+        The height of each present.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+    """
+    total_paper = 0
+    total_ribbon = 0
+
+    for length, width, height in zip(lengths, widths, heights):
+        total_paper += get_paper_amount(length, width, height)
+        total_ribbon += get_ribbon_amount(length, width, height)
+
+    return total_paper, total_ribbon
+
+
+def write_orders_file(path, num_lines, block_lines=1000000, seed=0):
+    """Writes a file with random dimensions, one per line.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    num_lines : int
+        The amount of lines.
+
+    block_lines : int
+        The amount of distinct random lines, repeated to fill the file.
+
+    seed : int
+        The seed of the random generator.
+    """
+    columns = generate_columns(min(block_lines, num_lines), seed)
+    lines = ["{}x{}x{}\n".format(*present) for present in zip(*columns)]
+
+    with open(path, "wb") as orders_file:
+        written = 0
+        while written < num_lines:
+            block = lines[: num_lines - written]
+            orders_file.write("".join(block).encode("utf-8"))
+            written += len(block)
+
+
+def benchmark_columnar():
+    """Compares the columnar totals against the scalar ones."""
+    for num_presents in (1000000, 10000000):
+        columns = generate_columns(num_presents)
+
+        start_time = time.perf_counter()
+        expected = get_total_amounts_scalar(*columns)
+        scalar = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        totals = get_total_amounts_columnar(*sort_dimensions(*columns))
+        columnar = time.perf_counter() - start_time
+
+        assert totals == expected
+
+        print("--- {} presents ---".format(num_presents))
+        print("Scalar: {:.2f}s".format(scalar))
+        print("Columnar: {:.2f}s ({:.2f}x)".format(columnar, scalar / columnar))
+
+
+def benchmark_sharded(num_lines, num_files):
+    """Measures how the sharded totals scale with the amount of workers.
+
+    Parameters
+    ----------
+    num_lines : int
+        The total amount of lines of the orders files.
+
+    num_files : int
+        The amount of orders files.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(num_files):
+            path = os.path.join(directory, "orders_{}.txt".format(i))
+            write_orders_file(path, num_lines // num_files, seed=i)
+            paths.append(path)
+
+        print("--- {} lines in {} files ---".format(num_lines, num_files))
+
+        # Sequential totals, one file at a time.
+        start_time = time.perf_counter()
+        expected = [0, 0]
+        for path in paths:
+            paper, ribbon = get_total_amounts_columnar(*load_dimensions_file(path))
+            expected[0] += paper
+            expected[1] += ribbon
+        sequential = time.perf_counter() - start_time
+        print("Sequential: {:.2f}s".format(sequential))
+
+        for workers in range(1, (os.cpu_count() or 1) + 1):
+            start_time = time.perf_counter()
+            totals = get_total_amounts_sharded(paths, workers)
+            elapsed = time.perf_counter() - start_time
+
+            assert list(totals) == expected
+
+            print(
+                "{} workers: {:.2f}s ({:.2f}x)".format(
+                    workers, elapsed, sequential / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for Day 2")
+    parser.add_argument("benchmark", choices=["columnar", "sharded"])
+    parser.add_argument(
+        "--lines",
+        type=int,
+        default=100000000,
+        help="amount of lines of the sharded workload (default: 100000000)",
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=8,
+        help="amount of files of the sharded workload (default: 8)",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark == "columnar":
+        benchmark_columnar()
+    else:
+        benchmark_sharded(args.lines, args.files)
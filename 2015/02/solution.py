@@ -49,6 +49,36 @@ For example:
 How many total feet of ribbon should they order?
 
 """
+import argparse
+import json
+import math
+import operator
+import os
+import re
+import sys
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+
+# Type of the lanes the columns of components are packed into, their size, and
+# the bound the components must be lower than to be packed.
+LANE_TYPE = "I"
+LANE_BITS = 8 * array(LANE_TYPE).itemsize
+LANE_BOUND = 1 << (LANE_BITS - 2)
+
+# The bytes a file of dimensions is made of, and the pattern of each line.
+DIGITS = b"0123456789"
+DIMENSION_BYTES = DIGITS + b"x\n"
+DIMENSION_PATTERN = re.compile(rb"\d+x\d+x\d+")
+
+# The whitespace ignored around each line, and the table that turns the
+# separators into commas, so the components read as a JSON list.
+WHITESPACE = (b" ", b"\t", b"\r", b"\f", b"\v")
+JSON_TABLE = bytes.maketrans(b"x\n", b",,")
+
+# Amount of malformed lines reported at most.
+MAX_REPORTED_LINES = 10
 
 
 def get_paper_amount(length, width, height):
@@ -227,17 +257,1009 @@ def get_total_amount_ribbon(dimensions):
     return total_amount
 
 
+def get_total_amounts(dimensions, extras=False, stats=None):
+    """Determine the total amount of wrapping paper and ribbon needed in a
+    single pass.
+
+    Parameters
+    ----------
+    dimensions : list of string
+        The list of dimensions of the presents.
+
+    extras : boolean
+        Boolean that indicates if the total volume and the amount of presents
+        must be returned as well.
+
+    stats : PresentStats or None
+        The statistics the amounts of each present are added to, or None.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+
+    total_volume : int
+        The total volume of the presents, only returned with extras.
+
+    num_presents : int
+        The amount of presents, only returned with extras.
+    """
+    total_paper = 0
+    total_ribbon = 0
+    total_volume = 0
+    num_presents = 0
+
+    for dimension in dimensions:
+        # Remove breaklines.
+        dim = dimension.strip()
+
+        # Get the components of the dimension, only once for every amount.
+        length, width, height = parse_dimension(dim)
+
+        # Add the amounts of the current present to the totals.
+        paper = get_paper_amount(length, width, height)
+        ribbon = get_ribbon_amount(length, width, height)
+
+        total_paper += paper
+        total_ribbon += ribbon
+        total_volume += length * width * height
+        num_presents += 1
+
+        if stats is not None:
+            stats.add(paper, ribbon)
+
+    if extras:
+        return total_paper, total_ribbon, total_volume, num_presents
+
+    return total_paper, total_ribbon
+
+
+def load_dimensions(dimensions):
+    """Loads the dimensions of the presents into columns, sorting the
+    components of each present.
+
+    Parameters
+    ----------
+    dimensions : list of string
+        The list of dimensions of the presents.
+
+    Returns
+    -------
+    smallest : array of int
+        The smallest component of each present.
+
+    middle : array of int
+        The middle component of each present.
+
+    largest : array of int
+        The largest component of each present.
+    """
+    # Parse every dimension into a single array of components.
+    components = array(
+        "q", chain.from_iterable(map(parse_dimension, map(str.strip, dimensions)))
+    )
+
+    # Split the components into their columns.
+    lengths = components[0::3]
+    widths = components[1::3]
+    heights = components[2::3]
+
+    return sort_dimensions(lengths, widths, heights)
+
+
+def pack_column(column):
+    """Packs a column of components into a single integer, one lane per
+    component.
+
+    Parameters
+    ----------
+    column : array of int
+        The column of components, each one lower than LANE_BOUND.
+
+    Returns
+    -------
+    packed : int
+        The integer with the i-th component in its i-th lane of LANE_BITS bits.
+    """
+    return int.from_bytes(array(LANE_TYPE, column).tobytes(), "little")
+
+
+def unpack_column(packed, size):
+    """Unpacks an integer into a column of components.
+
+    Parameters
+    ----------
+    packed : int
+        The integer with a component in each lane of LANE_BITS bits.
+
+    size : int
+        The amount of components.
+
+    Returns
+    -------
+    column : array of int
+        The column of components.
+    """
+    column = array(LANE_TYPE)
+    column.frombytes(packed.to_bytes(size * column.itemsize, "little"))
+
+    return column
+
+
+def get_packed_min_max(a, b, high_bits):
+    """Determines the lowest and the highest component of each lane of two
+    packed columns.
+
+    Parameters
+    ----------
+    a : int
+        The first packed column.
+
+    b : int
+        The second packed column.
+
+    high_bits : int
+        The integer with only the highest bit of each lane set.
+
+    Returns
+    -------
+    lowest : int
+        The packed column with the lowest component of each lane.
+
+    highest : int
+        The packed column with the highest component of each lane.
+    """
+    # As every component is lower than a quarter of a lane, each lane of the
+    # difference keeps its highest bit set only where a is not lower than b,
+    # and never borrows from the next lane.
+    not_lower = ((a | high_bits) - b) & high_bits
+    not_lower >>= LANE_BITS - 1
+
+    # Set every bit of the lanes where a is not lower than b, and swap them.
+    mask = (not_lower << LANE_BITS) - not_lower
+    swap = (a ^ b) & mask
+
+    return a ^ swap, b ^ swap
+
+
+def sort_dimensions(lengths, widths, heights):
+    """Sorts the components of each present.
+
+    When every component fits in a lane, the columns are packed into integers
+    and sorted a lane at a time with bitwise operations over whole columns.
+
+    Parameters
+    ----------
+    lengths : array of int
+        The length of each present.
+
+    widths : array of int
+        The width of each present.
+
+    heights : array of int
+        The height of each present.
+
+    Returns
+    -------
+    smallest : array of int
+        The smallest component of each present.
+
+    middle : array of int
+        The middle component of each present.
+
+    largest : array of int
+        The largest component of each present.
+    """
+    size = len(lengths)
+    columns = (lengths, widths, heights)
+
+    if size > 0 and all(0 <= min(c) and max(c) < LANE_BOUND for c in columns):
+        high_bits = pack_column(array(LANE_TYPE, [1 << (LANE_BITS - 1)]) * size)
+        packed_l, packed_w, packed_h = map(pack_column, columns)
+
+        # Sort the three components with three comparisons.
+        low, high = get_packed_min_max(packed_l, packed_w, high_bits)
+        smallest, other = get_packed_min_max(low, packed_h, high_bits)
+        middle, largest = get_packed_min_max(high, other, high_bits)
+
+        return tuple(unpack_column(c, size) for c in (smallest, middle, largest))
+
+    smallest = array("q", map(min, lengths, widths, heights))
+    largest = array("q", map(max, lengths, widths, heights))
+
+    # The middle component is what is left from the sum of the components.
+    sums = map(operator.add, map(operator.add, lengths, widths), heights)
+    middle = array(
+        "q", map(operator.sub, map(operator.sub, sums, smallest), largest)
+    )
+
+    return smallest, middle, largest
+
+
+def get_total_amounts_columnar(smallest, middle, largest):
+    """Determine the total amount of wrapping paper and ribbon needed from the
+    sorted columns of the dimensions.
+
+    Parameters
+    ----------
+    smallest : array of int
+        The smallest component of each present.
+
+    middle : array of int
+        The middle component of each present.
+
+    largest : array of int
+        The largest component of each present.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+    """
+    # Area of the smallest side of each present, which is also its slack. The
+    # areas are packed unless they could overflow 64 bits.
+    small_areas = map(operator.mul, smallest, middle)
+    if max(middle, default=0) ** 2 < 1 << 63:
+        small_areas = array("q", small_areas)
+    else:
+        small_areas = list(small_areas)
+
+    # Sum the areas of the two other kinds of sides together, as they share
+    # the largest component.
+    total_small = sum(small_areas)
+    total_other = sum(
+        map(operator.mul, largest, map(operator.add, smallest, middle))
+    )
+    total_paper = 3 * total_small + 2 * total_other
+
+    # The smallest perimeter is the wrap, and the volume is the bow.
+    total_wrap = 2 * (sum(smallest) + sum(middle))
+    total_bow = sum(map(operator.mul, small_areas, largest))
+    total_ribbon = total_wrap + total_bow
+
+    return total_paper, total_ribbon
+
+
+def is_well_formed(data):
+    """Checks that every line of a file of dimensions is well formed, without
+    splitting it into lines.
+
+    Parameters
+    ----------
+    data : bytes
+        The contents of the file, with or without the breakline that ends it.
+
+    Returns
+    -------
+    is_well_formed : boolean
+        The boolean that indicates if every line has the format LxWxH.
+    """
+    # Only digits, "x" and breaklines are allowed.
+    if len(data.translate(None, DIMENSION_BYTES)) > 0:
+        return False
+
+    # Without the digits, each line must be left with exactly two "x". There
+    # must be an "xx" before each breakline, and nothing else but the "xx" of
+    # the last line if the file does not end with a breakline.
+    num_breaklines = data.count(b"\n")
+    skeleton = data.translate(None, DIGITS)
+
+    if skeleton.count(b"xx\n") != num_breaklines:
+        return False
+
+    if data.endswith(b"\n"):
+        if len(skeleton) != 3 * num_breaklines:
+            return False
+    elif len(skeleton) != 3 * num_breaklines + 2 or not skeleton.endswith(b"xx"):
+        return False
+
+    # And every component must have at least one digit.
+    if data.startswith(b"x") or data.endswith(b"x"):
+        return False
+
+    return not any(empty in data for empty in (b"xx", b"\nx", b"x\n"))
+
+
+def find_malformed_lines(data):
+    """Finds the lines of a file of dimensions that are not well formed.
+
+    Parameters
+    ----------
+    data : bytes
+        The contents of the file, with or without the breakline that ends it.
+
+    Returns
+    -------
+    line_numbers : list of int
+        The number of each malformed line, starting at 1.
+    """
+    lines = data.split(b"\n")
+
+    # The breakline that ends the file does not start another line.
+    if data.endswith(b"\n"):
+        lines.pop()
+
+    line_numbers = []
+
+    for number, line in enumerate(lines, 1):
+        if DIMENSION_PATTERN.fullmatch(line) is None:
+            line_numbers.append(number)
+
+    return line_numbers
+
+
+def parse_dimensions_bytes(data):
+    """Parses the raw contents of a file of dimensions into columns, without
+    building a string for each line.
+
+    The contents are checked in place, and copied once with the separators
+    turned into commas, which the JSON parser reads as a single list. The
+    whitespace around each line is ignored, like the parsers of lines do, but
+    only files that have any are split into lines to remove it.
+
+    Parameters
+    ----------
+    data : bytes or mmap
+        The contents of the file, one dimension with the format LxWxH per line.
+
+    Returns
+    -------
+    lengths : array of int
+        The length of each present.
+
+    widths : array of int
+        The width of each present.
+
+    heights : array of int
+        The height of each present.
+
+    Raises
+    ------
+    ValueError
+        If any line is malformed, with the number of the malformed lines.
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+
+    if any(space in data for space in WHITESPACE):
+        data = b"\n".join(map(bytes.strip, data.split(b"\n")))
+
+    if len(data) == 0 or data == b"\n":
+        return array("q"), array("q"), array("q")
+
+    if not is_well_formed(data):
+        line_numbers = find_malformed_lines(data)
+
+        reported = ", ".join(map(str, line_numbers[:MAX_REPORTED_LINES]))
+        if len(line_numbers) > MAX_REPORTED_LINES:
+            reported += ", ..."
+
+        raise ValueError("Malformed dimensions on lines " + reported)
+
+    # Turn the components into a JSON list, whose parser builds every integer
+    # at once, leaving out the comma of the breakline that ends the file.
+    text = memoryview(data.translate(JSON_TABLE))
+    if data.endswith(b"\n"):
+        text = text[:-1]
+
+    # Components with leading zeroes are not valid JSON, so those are parsed
+    # one by one.
+    try:
+        components = array("q", json.loads(b"".join((b"[", text, b"]"))))
+    except ValueError:
+        components = array("q", map(int, bytes(text).split(b",")))
+
+    # Split the components into their columns.
+    return components[0::3], components[1::3], components[2::3]
+
+
+def load_dimensions_file(path):
+    """Loads the dimensions of a file into columns, sorting the components of
+    each present.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file, one dimension with the format LxWxH per line.
+
+    Returns
+    -------
+    smallest : array of int
+        The smallest component of each present.
+
+    middle : array of int
+        The middle component of each present.
+
+    largest : array of int
+        The largest component of each present.
+    """
+    with open(path, "rb") as dimensions_file:
+        data = dimensions_file.read()
+
+    return sort_dimensions(*parse_dimensions_bytes(data))
+
+
+def group_dimensions(dimensions):
+    """Groups the identical presents, sorting the components of each one.
+
+    Identical lines are counted first, so each distinct line is parsed only
+    once.
+
+    Parameters
+    ----------
+    dimensions : list of string
+        The list of dimensions of the presents.
+
+    Returns
+    -------
+    groups : Counter of tuple of int
+        The amount of presents with each sorted dimension (smallest, middle,
+        largest).
+    """
+    # Count the identical lines, removing breaklines.
+    line_counts = Counter(map(str.strip, dimensions))
+
+    # Lines with their components in another order are the same present.
+    groups = Counter()
+    for line, num_presents in line_counts.items():
+        present = tuple(sorted(parse_dimension(line)))
+        groups[present] += num_presents
+
+    return groups
+
+
+def get_grouped_table(groups):
+    """Determine the amount of wrapping paper and ribbon needed by each group of
+    identical presents.
+
+    Parameters
+    ----------
+    groups : Counter of tuple of int
+        The amount of presents with each sorted dimension, as returned by
+        group_dimensions.
+
+    Returns
+    -------
+    table : list of tuple
+        The rows (dimension, num_presents, total_paper, total_ribbon) of each
+        distinct present, from the most to the least common one.
+    """
+    table = []
+
+    for present, num_presents in groups.most_common():
+        # Determine the amounts once for every identical present.
+        paper = get_paper_amount(*present)
+        ribbon = get_ribbon_amount(*present)
+
+        row = (present, num_presents, num_presents * paper, num_presents * ribbon)
+        table.append(row)
+
+    return table
+
+
+def get_total_amounts_grouped(dimensions):
+    """Determine the total amount of wrapping paper and ribbon needed, once for
+    every distinct present.
+
+    Parameters
+    ----------
+    dimensions : list of string
+        The list of dimensions of the presents.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+    """
+    table = get_grouped_table(group_dimensions(dimensions))
+
+    total_paper = sum(row[2] for row in table)
+    total_ribbon = sum(row[3] for row in table)
+
+    return total_paper, total_ribbon
+
+
+class QuantileSketch:
+    """Approximate quantiles of non-negative amounts in bounded memory.
+
+    Each amount is counted in a bucket whose bounds grow geometrically, so the
+    amount of buckets only grows with the logarithm of the largest amount, and
+    every quantile is within the relative accuracy of an amount of the same
+    rank. Sketches with the same accuracy can be merged.
+
+    Parameters
+    ----------
+    relative_accuracy : float
+        The relative accuracy of the quantiles, between 0 and 1.
+
+    Attributes
+    ----------
+    buckets : Counter of int
+        The amount of positive amounts counted in each bucket.
+
+    zeros : int
+        The amount of amounts equal to zero.
+
+    count : int
+        The amount of amounts added.
+
+    max : int or None
+        The largest amount added, or None if no amount was added.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+
+        self.buckets = Counter()
+        self.zeros = 0
+        self.count = 0
+        self.max = None
+
+    def add(self, amount):
+        """Adds an amount to the sketch.
+
+        Parameters
+        ----------
+        amount : int
+            The non-negative amount.
+        """
+        if amount > 0:
+            # The i-th bucket holds the amounts in (gamma^(i - 1), gamma^i].
+            self.buckets[math.ceil(math.log(amount) / self.log_gamma)] += 1
+        else:
+            self.zeros += 1
+
+        self.count += 1
+        if self.max is None or amount > self.max:
+            self.max = amount
+
+    def merge(self, other):
+        """Adds the amounts of another sketch to the sketch.
+
+        Parameters
+        ----------
+        other : QuantileSketch
+            The sketch, with the same relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracies")
+
+        self.buckets.update(other.buckets)
+        self.zeros += other.zeros
+        self.count += other.count
+
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def quantile(self, q):
+        """Returns the approximate quantile of the amounts.
+
+        Parameters
+        ----------
+        q : float
+            The quantile, between 0 and 1.
+
+        Returns
+        -------
+        amount : float or None
+            The approximate amount with rank q, or None if no amount was added.
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+
+        if rank < self.zeros:
+            return 0
+
+        # Find the bucket of the amount with the rank.
+        seen = self.zeros
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+
+            if seen > rank:
+                break
+
+        # The middle of the bucket is within the accuracy of its amounts.
+        amount = 2 * self.gamma**i / (self.gamma + 1)
+
+        return min(amount, self.max)
+
+
+class Histogram:
+    """Counts of amounts in buckets of a fixed width.
+
+    Histograms with the same buckets can be merged.
+
+    Parameters
+    ----------
+    bucket_width : int
+        The width of each bucket.
+
+    num_buckets : int
+        The amount of buckets, starting at zero.
+
+    Attributes
+    ----------
+    counts : list of int
+        The amount of amounts in each bucket.
+
+    overflow : int
+        The amount of amounts past the last bucket.
+    """
+
+    def __init__(self, bucket_width, num_buckets):
+        self.bucket_width = bucket_width
+        self.counts = [0] * num_buckets
+        self.overflow = 0
+
+    def add(self, amount):
+        """Adds an amount to the histogram.
+
+        Parameters
+        ----------
+        amount : int
+            The non-negative amount.
+        """
+        i = amount // self.bucket_width
+
+        if i < len(self.counts):
+            self.counts[i] += 1
+        else:
+            self.overflow += 1
+
+    def merge(self, other):
+        """Adds the amounts of another histogram to the histogram.
+
+        Parameters
+        ----------
+        other : Histogram
+            The histogram, with the same buckets.
+        """
+        if (other.bucket_width, len(other.counts)) != (
+            self.bucket_width,
+            len(self.counts),
+        ):
+            raise ValueError("Cannot merge histograms with different buckets")
+
+        self.counts = list(map(operator.add, self.counts, other.counts))
+        self.overflow += other.overflow
+
+    def buckets(self):
+        """Returns the buckets of the histogram.
+
+        Returns
+        -------
+        buckets : list of tuple
+            The (low, high, count) of each bucket, with the amounts in
+            [low, high).
+        """
+        return [
+            (i * self.bucket_width, (i + 1) * self.bucket_width, count)
+            for i, count in enumerate(self.counts)
+        ]
+
+
+class PresentStats:
+    """Distribution statistics of the amounts needed by each present.
+
+    The paper needed by each present is kept in a quantile sketch, and the
+    ribbon in a histogram, so the memory used does not grow with the amount of
+    presents. Statistics with the same parameters can be merged.
+
+    Parameters
+    ----------
+    relative_accuracy : float
+        The relative accuracy of the paper quantiles.
+
+    ribbon_bucket_width : int
+        The width of each bucket of the ribbon histogram.
+
+    ribbon_num_buckets : int
+        The amount of buckets of the ribbon histogram.
+
+    Attributes
+    ----------
+    paper : QuantileSketch
+        The sketch of the paper needed by each present.
+
+    ribbon : Histogram
+        The histogram of the ribbon needed by each present.
+    """
+
+    def __init__(
+        self, relative_accuracy=0.01, ribbon_bucket_width=100, ribbon_num_buckets=100
+    ):
+        self.paper = QuantileSketch(relative_accuracy)
+        self.ribbon = Histogram(ribbon_bucket_width, ribbon_num_buckets)
+
+    def add(self, paper, ribbon):
+        """Adds the amounts needed by a present.
+
+        Parameters
+        ----------
+        paper : int
+            The amount of wrapping paper needed by the present.
+
+        ribbon : int
+            The amount of ribbon needed by the present.
+        """
+        self.paper.add(paper)
+        self.ribbon.add(ribbon)
+
+    def add_columns(self, smallest, middle, largest):
+        """Adds the amounts needed by presents given by sorted columns.
+
+        Parameters
+        ----------
+        smallest : array of int
+            The smallest component of each present.
+
+        middle : array of int
+            The middle component of each present.
+
+        largest : array of int
+            The largest component of each present.
+        """
+        for small, mid, large in zip(smallest, middle, largest):
+            small_area = small * mid
+            pair = small + mid
+
+            self.add(3 * small_area + 2 * large * pair, 2 * pair + small_area * large)
+
+    def empty(self):
+        """Returns empty statistics with the same parameters, that can be merged
+        into these.
+
+        Returns
+        -------
+        stats : PresentStats
+            The empty statistics.
+        """
+        return PresentStats(
+            self.paper.relative_accuracy,
+            self.ribbon.bucket_width,
+            len(self.ribbon.counts),
+        )
+
+    def merge(self, other):
+        """Adds the amounts of other statistics to the statistics.
+
+        Parameters
+        ----------
+        other : PresentStats
+            The statistics, with the same parameters.
+        """
+        self.paper.merge(other.paper)
+        self.ribbon.merge(other.ribbon)
+
+
+def split_file(path, shard_size):
+    """Splits a file into byte ranges that start and end on line boundaries.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    shard_size : int
+        The approximate amount of bytes of each range.
+
+    Returns
+    -------
+    shards : list of tuple
+        The (path, start, stop) of each range, in order.
+    """
+    size = os.path.getsize(path)
+    shards = []
+
+    with open(path, "rb") as shard_file:
+        start = 0
+        while start < size:
+            # Move the end of the range to the end of its last line.
+            stop = start + shard_size
+            if stop < size:
+                shard_file.seek(stop)
+                shard_file.readline()
+                stop = shard_file.tell()
+            else:
+                stop = size
+
+            shards.append((path, start, stop))
+            start = stop
+
+    return shards
+
+
+def get_shard_totals(path, start, stop, stats=None):
+    """Determine the total amount of wrapping paper and ribbon needed by the
+    presents in a range of a file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    start : int
+        The byte where the range starts, at the start of a line.
+
+    stop : int
+        The byte where the range ends (not included), at the end of a line.
+
+    stats : PresentStats or None
+        The statistics the amounts of each present are added to, or None.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+
+    stats : PresentStats or None
+        The statistics with the amounts of the presents added.
+    """
+    with open(path, "rb") as shard_file:
+        shard_file.seek(start)
+        data = shard_file.read(stop - start)
+
+    try:
+        columns = parse_dimensions_bytes(data)
+    except ValueError as error:
+        raise ValueError("{}, from byte {}: {}".format(path, start, error))
+
+    columns = sort_dimensions(*columns)
+
+    if stats is not None:
+        stats.add_columns(*columns)
+
+    return get_total_amounts_columnar(*columns) + (stats,)
+
+
+def get_total_amounts_sharded(
+    paths, workers=None, shard_size=67108864, progress=None, stats=None
+):
+    """Determine the total amount of wrapping paper and ribbon needed by the
+    presents of several files, using a pool of processes.
+
+    The files are split into ranges of lines that are handed to the workers,
+    and the totals of the ranges are added in order.
+
+    Parameters
+    ----------
+    paths : list of str
+        The paths of the files, one dimension with the format LxWxH per line.
+
+    workers : int or None
+        The amount of worker processes, or None to use every available core.
+
+    shard_size : int
+        The approximate amount of bytes each worker processes per task.
+
+    progress : function or None
+        The function called with the amount of finished ranges and the total
+        amount of ranges every time a range is finished, or None.
+
+    stats : PresentStats or None
+        The statistics the amounts of each present are added to, or None. Each
+        worker fills empty statistics with the same parameters, and those are
+        merged into them.
+
+    Returns
+    -------
+    total_paper : int
+        The total amount of wrapping paper needed.
+
+    total_ribbon : int
+        The total amount of ribbon needed.
+    """
+    shards = [shard for path in paths for shard in split_file(path, shard_size)]
+
+    # Send empty statistics to each worker, so the amounts already in the
+    # statistics are not merged back once per range.
+    if stats is not None:
+        empty = stats.empty()
+    else:
+        empty = None
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(get_shard_totals, *shard, empty) for shard in shards]
+
+        if progress is not None:
+            for num_done, _ in enumerate(as_completed(futures), 1):
+                progress(num_done, len(futures))
+
+        # Add the totals in the order of the ranges.
+        totals = [future.result() for future in futures]
+
+    total_paper = sum(paper for paper, _, _ in totals)
+    total_ribbon = sum(ribbon for _, ribbon, _ in totals)
+
+    if stats is not None:
+        for _, _, shard_stats in totals:
+            stats.merge(shard_stats)
+
+    return total_paper, total_ribbon
+
+
 if __name__ == "__main__":
-    # Read the input file, and process its contents.
-    input_file = open("input.txt", "r")
-    inputs = input_file.readlines()
+    parser = argparse.ArgumentParser(
+        description="Day 2: I Was Told There Would Be No Math"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["input.txt"],
+        help="files with the dimensions of the presents (default: input.txt)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="amount of worker processes the files are shared by (default: 1)",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="print the distribution of the amounts needed by each present",
+    )
+    args = parser.parse_args()
+
+    stats = PresentStats() if args.stats else None
+
+    if args.workers > 1:
+
+        def report_progress(num_done, num_shards):
+            """Prints the amount of finished ranges."""
+            print("Shards: {}/{}".format(num_done, num_shards), file=sys.stderr)
+
+        # Process the input files in ranges with the worker processes.
+        total_paper, total_ribbon = get_total_amounts_sharded(
+            args.paths, args.workers, progress=report_progress, stats=stats
+        )
+    else:
+        # Read the input files, and process their contents in bulk.
+        total_paper = 0
+        total_ribbon = 0
 
-    print("--- First Part ---")
-    total_paper = get_total_amount_paper(inputs)
+        for path in args.paths:
+            columns = load_dimensions_file(path)
 
+            # Determine the totals of both parts from the same columns.
+            paper, ribbon = get_total_amounts_columnar(*columns)
+            total_paper += paper
+            total_ribbon += ribbon
+
+            if stats is not None:
+                stats.add_columns(*columns)
+
+    print("--- First Part ---")
     print("Total wrapping paper needed: ", total_paper)
 
     print("--- Second Part ---")
-    total_ribbon = get_total_amount_ribbon(inputs)
-
     print("Total wrapping paper needed: ", total_ribbon)
+
+    if stats is not None:
+        print("--- Statistics ---")
+        print("Paper per present p50:", round(stats.paper.quantile(0.5)))
+        print("Paper per present p99:", round(stats.paper.quantile(0.99)))
+        print("Paper per present max:", stats.paper.max)
+
+        print("Ribbon per present:")
+        for low, high, count in stats.ribbon.buckets():
+            if count > 0:
+                print("  [{}, {}): {}".format(low, high, count))
+        if stats.ribbon.overflow > 0:
+            print("  overflow: {}".format(stats.ribbon.overflow))
@@ -0,0 +1,140 @@
+"""Benchmarks for Day 3: Perfectly Spherical Houses in a Vacuum.
+
+Run from this directory with: python benchmark.py
+
+"""
+import multiprocessing
+import random
+import resource
+import time
+
+from solution import determine_visited_houses, visit_houses_compact
+
+
+def generate_route(num_moves, seed=0):
+    """Generates a random route.
+
+    Parameters
+    ----------
+    num_moves : int
+        The amount of moves of the route.
+
+    seed : int
+        The seed of the random generator.
+
+    Returns
+    -------
+    instruction_str : str
+        The instructions of the route.
+    """
+    rng = random.Random(seed)
+
+    # Turn each random byte into one of the four moves.
+    moves = bytes.maketrans(bytes(range(256)), b"^v<>" * 64)
+
+    return rng.randbytes(num_moves).translate(moves).decode("ascii")
+
+
+def measure_peak_memory(function, num_moves, results):
+    """Measures the peak memory of the process while following a route.
+
+    Parameters
+    ----------
+    function : function
+        The function that follows the route.
+
+    num_moves : int
+        The amount of moves of the route.
+
+    results : Queue
+        The queue where the result of the function, the seconds it took, and
+        the growth of the peak resident memory in bytes are put.
+    """
+    instruction_str = generate_route(num_moves)
+
+    # The peak resident memory is reported in kilobytes.
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start_time = time.perf_counter()
+    result = function(instruction_str)
+    elapsed = time.perf_counter() - start_time
+
+    peak_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    results.put((result, elapsed, 1024 * (peak_after - peak_before)))
+
+
+def count_compact(instruction_str):
+    """Determines the amount of visited houses and the bytes of the packed set.
+
+    Parameters
+    ----------
+    instruction_str : str
+        The instructions that indicate to which direction Santa must move.
+
+    Returns
+    -------
+    num_visited_houses : int
+        The amount of houses Santa has been to.
+
+    nbytes : int
+        The amount of bytes used by the packed set.
+    """
+    visited_coordinates = visit_houses_compact(instruction_str)
+
+    return len(visited_coordinates), visited_coordinates.nbytes()
+
+
+def run_isolated(function, num_moves):
+    """Runs a measurement in a new process, so its peak memory is its own.
+
+    Parameters
+    ----------
+    function : function
+        The function that follows the route.
+
+    num_moves : int
+        The amount of moves of the route.
+
+    Returns
+    -------
+    result
+        The value returned by the function.
+
+    elapsed : float
+        The amount of seconds the function took.
+
+    peak : int
+        The growth of the peak resident memory in bytes.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+
+    process = context.Process(
+        target=measure_peak_memory, args=(function, num_moves, results)
+    )
+    process.start()
+    measurement = results.get()
+    process.join()
+
+    return measurement
+
+
+if __name__ == "__main__":
+    for num_moves in (1000000, 10000000):
+        print("--- {} moves ---".format(num_moves))
+
+        houses, elapsed, peak = run_isolated(determine_visited_houses, num_moves)
+        print(
+            "Tuple set: {} houses, {:.2f}s, peak RSS +{:.1f} MB ({:.0f} B/house)".format(
+                houses, elapsed, peak / 2**20, peak / houses
+            )
+        )
+
+        (houses, nbytes), elapsed, peak = run_isolated(count_compact, num_moves)
+        print(
+            "Packed set: {} houses, {:.2f}s, peak RSS +{:.1f} MB ({:.0f} B/house), "
+            "table {:.1f} MB".format(
+                houses, elapsed, peak / 2**20, peak / houses, nbytes / 2**20
+            )
+        )
@@ -48,6 +48,40 @@ For example:
   and Robo-Santa going the other.
 
 """
+import operator
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import accumulate, chain, count, islice
+
+# Offset added to each coordinate so that it packs as a non-negative number.
+COORDINATE_OFFSET = 1 << 31
+
+# Multiplier of the Fibonacci hashing of the packed coordinates.
+HASH_MULTIPLIER = 11400714819323198485
+
+# Fraction of the table of the packed set that can be used before it grows.
+MAX_LOAD = 0.75
+
+# The valid instructions.
+INSTRUCTIONS = b"^v<>"
+
+# Distance between the keys of consecutive X coordinates used by the bulk
+# functions. It is larger than twice any Y coordinate, so each coordinate has
+# its own key, and it is not a multiple of a large power of two, so the keys
+# spread evenly over the slots of a set.
+KEY_STRIDE = (1 << 32) + 1000003
+
+# Change of the key caused by each instruction, indexed by its byte.
+KEY_STEPS = [0] * 256
+KEY_STEPS[ord("^")] = 1
+KEY_STEPS[ord("v")] = -1
+KEY_STEPS[ord(">")] = KEY_STRIDE
+KEY_STEPS[ord("<")] = -KEY_STRIDE
+
+# Amount of instructions followed at once by the bulk functions.
+CHUNK_SIZE = 1048576
 
 
 def determine_visited_houses(instruction_str):
@@ -162,6 +196,617 @@ def determine_visited_houses_with_robot(instruction_str):
     return num_visited_houses
 
 
+def pack_coordinate(x, y):
+    """Packs a coordinate into a single 64-bit number.
+
+    Parameters
+    ----------
+    x : int
+        The X coordinate, greater than -2^31 and lower than 2^31.
+
+    y : int
+        The Y coordinate, greater than -2^31 and lower than 2^31.
+
+    Returns
+    -------
+    key : int
+        The packed coordinate, never zero.
+    """
+    return ((x + COORDINATE_OFFSET) << 32) | (y + COORDINATE_OFFSET)
+
+
+class PackedCoordinateSet:
+    """Set of coordinates packed into 64-bit numbers.
+
+    The packed coordinates are kept in an open-addressing hash table backed by
+    a single array, so each coordinate takes between 11 and 22 bytes instead of
+    a tuple and its two integers.
+
+    Parameters
+    ----------
+    capacity : int
+        The initial amount of slots of the table, a power of two.
+
+    Attributes
+    ----------
+    table : array of int
+        The slots of the table, zero if empty.
+
+    size : int
+        The amount of coordinates in the set.
+    """
+
+    def __init__(self, capacity=1024):
+        self.table = array("Q", bytes(8 * capacity))
+        self.size = 0
+        self.shift = 64 - (capacity.bit_length() - 1)
+
+    def __len__(self):
+        """Returns the amount of coordinates in the set."""
+        return self.size
+
+    def __contains__(self, coordinate):
+        """Returns whether an (X, Y) coordinate is in the set."""
+        key = pack_coordinate(*coordinate)
+        table = self.table
+        mask = len(table) - 1
+
+        # Follow the slots from the home slot of the key until an empty one.
+        i = ((key * HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        while table[i] != 0:
+            if table[i] == key:
+                return True
+
+            i = (i + 1) & mask
+
+        return False
+
+    def add(self, x, y):
+        """Adds a coordinate to the set.
+
+        Parameters
+        ----------
+        x : int
+            The X coordinate.
+
+        y : int
+            The Y coordinate.
+        """
+        self.add_key(pack_coordinate(x, y))
+
+    def add_key(self, key):
+        """Adds a packed coordinate to the set.
+
+        Parameters
+        ----------
+        key : int
+            The packed coordinate.
+        """
+        table = self.table
+        mask = len(table) - 1
+
+        # Follow the slots from the home slot of the key until the key or an
+        # empty slot is found.
+        i = ((key * HASH_MULTIPLIER) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+        while True:
+            current = table[i]
+
+            if current == key:
+                return
+
+            if current == 0:
+                break
+
+            i = (i + 1) & mask
+
+        table[i] = key
+        self.size += 1
+
+        if self.size > MAX_LOAD * len(table):
+            self.grow()
+
+    def grow(self):
+        """Doubles the amount of slots of the table."""
+        old_table = self.table
+
+        self.table = array("Q", bytes(16 * len(old_table)))
+        self.size = 0
+        self.shift -= 1
+
+        for key in old_table:
+            if key != 0:
+                self.add_key(key)
+
+    def nbytes(self):
+        """Returns the amount of bytes used by the table."""
+        return len(self.table) * self.table.itemsize
+
+
+def visit_houses_compact(instruction_str):
+    """Returns the houses Santa visits given the instructions, as a packed set.
+
+    Parameters
+    ----------
+    instruction_str : str
+        The instructions that indicate to which direction Santa must move.
+
+    Returns
+    -------
+    visited_coordinates : PackedCoordinateSet or None
+        The coordinates of the houses Santa has been to, or None if an invalid
+        instruction is found.
+    """
+    # Current (X, Y) position Santa has.
+    X = 0
+    Y = 0
+
+    # The X and Y coordinates Santa has travelled.
+    visited_coordinates = PackedCoordinateSet()
+    visited_coordinates.add(X, Y)
+
+    # Follow the instructions and move accordingly.
+    for c in instruction_str:
+        if c == "^":
+            Y += 1
+        elif c == "v":
+            Y -= 1
+        elif c == ">":
+            X += 1
+        elif c == "<":
+            X -= 1
+        else:
+            return None
+
+        # Append the current coordinate to the visited coordinates.
+        visited_coordinates.add(X, Y)
+
+    return visited_coordinates
+
+
+def determine_visited_houses_compact(instruction_str):
+    """Determines the amount of visited houses given the instructions, keeping
+    the visited houses in a packed set.
+
+    Parameters
+    ----------
+    instruction_str : str
+        The instructions that indicate to which direction Santa must move.
+
+    Returns
+    -------
+    num_visited_houses : int or None
+        The amount of houses Santa has been to, or None if an invalid
+        instruction is found.
+    """
+    visited_coordinates = visit_houses_compact(instruction_str)
+
+    if visited_coordinates is None:
+        return None
+
+    return len(visited_coordinates)
+
+
+def get_coordinate_key(x, y):
+    """Returns the key of a coordinate used by the bulk functions.
+
+    Parameters
+    ----------
+    x : int
+        The X coordinate.
+
+    y : int
+        The Y coordinate, greater than -2^31 and lower than 2^31.
+
+    Returns
+    -------
+    key : int
+        The key of the coordinate.
+    """
+    return x * KEY_STRIDE + y
+
+
+def get_key_coordinate(key):
+    """Returns the coordinate of a key used by the bulk functions.
+
+    Parameters
+    ----------
+    key : int
+        The key of the coordinate.
+
+    Returns
+    -------
+    coordinate : tuple of int
+        The (X, Y) coordinate.
+    """
+    half = KEY_STRIDE // 2
+    x, y = divmod(key + half, KEY_STRIDE)
+
+    return x, y - half
+
+
+def get_trajectory_keys(instructions, key):
+    """Returns the keys of the coordinates Santa goes through following a chunk
+    of instructions, in bulk.
+
+    Parameters
+    ----------
+    instructions : bytes
+        The chunk of instructions, with only valid characters.
+
+    key : int
+        The key of the coordinate where Santa starts.
+
+    Returns
+    -------
+    keys : iterator of int
+        The key of the coordinate where Santa starts, and after each
+        instruction.
+    """
+    # Each instruction adds its step to the key, so the keys are the
+    # cumulative sum of the steps.
+    return accumulate(map(KEY_STEPS.__getitem__, instructions), initial=key)
+
+
+def get_visited_keys(instructions, chunk_size=CHUNK_SIZE):
+    """Returns the keys of the coordinates of the houses Santa visits,
+    following the instructions in chunks.
+
+    Parameters
+    ----------
+    instructions : str or bytes
+        The instructions that indicate to which direction Santa must move.
+
+    chunk_size : int
+        The amount of instructions followed at once.
+
+    Returns
+    -------
+    visited_keys : set of int or None
+        The keys of the coordinates of the houses Santa has been to, or None if
+        an invalid instruction is found.
+    """
+    # If any character is not an instruction, return None.
+    try:
+        route = get_instruction_bytes(instructions)
+    except ValueError:
+        return None
+
+    return set(get_route_keys(route, chunk_size))
+
+
+def determine_visited_houses_bulk(instruction_str, chunk_size=CHUNK_SIZE):
+    """Determines the amount of visited houses given the instructions, following
+    them in bulk.
+
+    Parameters
+    ----------
+    instruction_str : str or bytes
+        The instructions that indicate to which direction Santa must move.
+
+    chunk_size : int
+        The amount of instructions followed at once, which bounds the size of
+        the trajectory held in memory.
+
+    Returns
+    -------
+    num_visited_houses : int or None
+        The amount of houses Santa has been to, or None if an invalid
+        instruction is found.
+    """
+    visited_keys = get_visited_keys(instruction_str, chunk_size)
+
+    if visited_keys is None:
+        return None
+
+    return len(visited_keys)
+
+
+def determine_visited_houses_with_agents(instruction_str, num_agents, workers=1):
+    """Determines the amount of visited houses by several agents that take
+    turns following the instructions.
+
+    The j-th agent follows the instructions j, j + N, j + 2N, and so on, so the
+    route of each agent is a strided slice of the instructions and is followed
+    on its own.
+
+    Parameters
+    ----------
+    instruction_str : str or bytes
+        The instructions that indicate to which direction the agents must move.
+
+    num_agents : int
+        The amount of agents, all of them starting at the same house.
+
+    workers : int
+        The amount of worker processes the routes are followed by.
+
+    Returns
+    -------
+    num_visited_houses : int or None
+        The amount of houses the agents have been to, or None if an invalid
+        instruction is found.
+    """
+    routes = [instruction_str[j::num_agents] for j in range(num_agents)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            agent_keys = list(pool.map(get_visited_keys, routes))
+    else:
+        agent_keys = list(map(get_visited_keys, routes))
+
+    # If any agent found an invalid instruction, return None.
+    if any(keys is None for keys in agent_keys):
+        return None
+
+    # Merge the houses of every agent.
+    visited_keys = set().union(*agent_keys)
+
+    return len(visited_keys)
+
+
+def get_instruction_bytes(instructions):
+    """Returns the instructions as bytes, checking that they are valid.
+
+    Parameters
+    ----------
+    instructions : str or bytes
+        The instructions that indicate to which direction Santa must move.
+
+    Returns
+    -------
+    instructions : bytes
+        The instructions.
+
+    Raises
+    ------
+    ValueError
+        If an invalid instruction is found.
+    """
+    if isinstance(instructions, str):
+        if not instructions.isascii():
+            raise ValueError("Invalid instruction found")
+
+        instructions = bytes(instructions, "ascii")
+
+    if len(instructions.translate(None, INSTRUCTIONS)) > 0:
+        raise ValueError("Invalid instruction found")
+
+    return instructions
+
+
+def get_route_keys(route, chunk_size=CHUNK_SIZE):
+    """Returns the keys of the coordinates Santa goes through following a route,
+    in chunks.
+
+    Parameters
+    ----------
+    route : bytes
+        The instructions of the route, with only valid characters.
+
+    chunk_size : int
+        The amount of instructions followed at once.
+
+    Returns
+    -------
+    keys : iterator of int
+        The key of the starting coordinate, and of the coordinate after each
+        instruction.
+    """
+
+    def get_chunk_keys():
+        """Yields the keys of each chunk of the route."""
+        key = get_coordinate_key(0, 0)
+        yield (key,)
+
+        for start in range(0, len(route), chunk_size):
+            chunk = route[start : start + chunk_size]
+
+            # Skip the coordinate where the chunk starts, already yielded.
+            yield islice(get_trajectory_keys(chunk, key), 1, None)
+
+            # Move to the end of the chunk.
+            dx = chunk.count(b">") - chunk.count(b"<")
+            dy = chunk.count(b"^") - chunk.count(b"v")
+            key += get_coordinate_key(dx, dy)
+
+    return chain.from_iterable(get_chunk_keys())
+
+
+class DeliveryIndex:
+    """Index of the presents delivered to each house.
+
+    The routes are followed once, counting the presents of each house, and the
+    counts are kept in compact sorted arrays that answer the queries without
+    following the routes again.
+
+    Parameters
+    ----------
+    instructions : str or bytes
+        The instructions that indicate to which direction the agents must move.
+
+    num_agents : int
+        The amount of agents taking turns, 1 for Santa alone and 2 for Santa
+        and Robo-Santa.
+
+    chunk_size : int
+        The amount of instructions followed at once.
+
+    Attributes
+    ----------
+    keys : array of int
+        The key of the coordinate of each house, in increasing order.
+
+    counts : array of int
+        The amount of presents delivered to each house, in the same order.
+
+    busiest : array of int
+        The indices of the houses, from the most to the least presents.
+
+    sorted_counts : array of int
+        The amounts of presents delivered to the houses, in increasing order.
+    """
+
+    def __init__(self, instructions, num_agents=1, chunk_size=CHUNK_SIZE):
+        instructions = get_instruction_bytes(instructions)
+
+        # Every agent delivers a present at the starting house, and after each
+        # of its instructions.
+        presents = Counter()
+        for j in range(num_agents):
+            presents.update(get_route_keys(instructions[j::num_agents], chunk_size))
+
+        # Move the counts into arrays sorted by key, without building a pair per
+        # house, and drop the counter before sorting the houses by count.
+        self.keys = array("q", sorted(presents))
+        self.counts = array("q", map(presents.__getitem__, self.keys))
+        del presents
+
+        self.busiest = array(
+            "q",
+            sorted(range(len(self.counts)), key=self.counts.__getitem__, reverse=True),
+        )
+        self.sorted_counts = array("q", sorted(self.counts))
+
+    def __len__(self):
+        """Returns the amount of houses that got at least one present."""
+        return len(self.keys)
+
+    def presents_at(self, x, y):
+        """Returns the amount of presents delivered to a house.
+
+        Parameters
+        ----------
+        x : int
+            The X coordinate of the house.
+
+        y : int
+            The Y coordinate of the house.
+
+        Returns
+        -------
+        num_presents : int
+            The amount of presents delivered to the house.
+        """
+        key = get_coordinate_key(x, y)
+        i = bisect_left(self.keys, key)
+
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.counts[i]
+
+        return 0
+
+    def top(self, k):
+        """Returns the houses that got the most presents.
+
+        Parameters
+        ----------
+        k : int
+            The amount of houses.
+
+        Returns
+        -------
+        houses : list of tuple
+            The ((X, Y), num_presents) of the k houses with the most presents,
+            from the most to the least presents.
+        """
+        return [
+            (get_key_coordinate(self.keys[i]), self.counts[i])
+            for i in self.busiest[:k]
+        ]
+
+    def count_at_least(self, m):
+        """Returns the amount of houses that got at least m presents.
+
+        Parameters
+        ----------
+        m : int
+            The amount of presents.
+
+        Returns
+        -------
+        num_houses : int
+            The amount of houses that got at least m presents.
+        """
+        return len(self.sorted_counts) - bisect_left(self.sorted_counts, m)
+
+
+class FirstVisitIndex:
+    """Index of the step at which Santa first visits each house.
+
+    The route is followed once, keeping the first step at each house and the
+    amount of distinct houses visited after each step, so both are answered in
+    constant time.
+
+    Parameters
+    ----------
+    instructions : str or bytes
+        The instructions that indicate to which direction Santa must move.
+
+    chunk_size : int
+        The amount of instructions followed at once.
+
+    Attributes
+    ----------
+    first_steps : dict of int to int
+        The first step at each house, indexed by the key of its coordinate.
+
+    visited_by : array of int
+        The amount of distinct houses visited after each step, starting with
+        the starting house at step 0.
+    """
+
+    def __init__(self, instructions, chunk_size=CHUNK_SIZE):
+        instructions = get_instruction_bytes(instructions)
+
+        # Keep the first step at each house: setdefault only stores the step
+        # of a house the first time, and returns the stored one.
+        self.first_steps = {}
+        keys = get_route_keys(instructions, chunk_size)
+        first_steps = map(self.first_steps.setdefault, keys, count())
+
+        # A step visits a new house when the house was first visited at it.
+        new_houses = map(operator.eq, first_steps, count())
+        self.visited_by = array("q", accumulate(new_houses))
+
+    def __len__(self):
+        """Returns the amount of instructions followed."""
+        return len(self.visited_by) - 1
+
+    def houses_visited_by(self, step):
+        """Returns the amount of distinct houses visited after a step.
+
+        Parameters
+        ----------
+        step : int
+            The amount of instructions followed.
+
+        Returns
+        -------
+        num_visited_houses : int
+            The amount of houses Santa has been to.
+        """
+        return self.visited_by[step]
+
+    def first_visit(self, x, y):
+        """Returns the step at which Santa first visits a house.
+
+        Parameters
+        ----------
+        x : int
+            The X coordinate of the house.
+
+        y : int
+            The Y coordinate of the house.
+
+        Returns
+        -------
+        step : int or None
+            The first step at the house, 0 for the starting house, or None if
+            Santa never visits it.
+        """
+        return self.first_steps.get(get_coordinate_key(x, y))
+
+
 if __name__ == "__main__":
     # Read the input file, and process its contents.
     input_file = open("input.txt", "r")
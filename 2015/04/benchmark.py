@@ -0,0 +1,101 @@
+"""Benchmarks for Day 4: The Ideal Stocking Stuffer.
+
+Run from this directory with: python benchmark.py
+
+"""
+import hashlib
+import time
+
+from solution import search_range
+
+
+def search_range_reference(key_str, k, start, stop):
+    """Finds the lowest value in [start, stop) whose hash has k leading zeroes,
+    building and comparing the hexadecimal hash of every value.
+
+    Parameters
+    ----------
+    key_str : str
+        The key string.
+
+    k : int
+        The amount of leading zeroes the hash must have.
+
+    start : int
+        The first value to check.
+
+    stop : int
+        The value where the search stops (not included).
+
+    Returns
+    -------
+    value : int or None
+        The lowest value in the range that produces a hash with k leading
+        zeroes, or None if no value in the range does.
+    """
+    for i in range(start, stop):
+        # Build the key with the value.
+        key = key_str + str(i)
+
+        # Get the MD5 hash of the key.
+        h = hashlib.md5(bytes(key, "utf-8")).hexdigest()
+
+        # Check if the first k bytes of the hash are zero.
+        are_zeros = True
+        for j in range(k):
+            are_zeros = are_zeros and h[j] == "0"
+
+        if are_zeros:
+            return i
+
+    return None
+
+
+def measure_rate(search, key_str, count):
+    """Measures how many candidates per second a search function checks.
+
+    Parameters
+    ----------
+    search : function
+        The search function, with the same parameters as search_range.
+
+    key_str : str
+        The key string.
+
+    count : int
+        The amount of candidates to check.
+
+    Returns
+    -------
+    rate : float
+        The amount of candidates checked per second.
+    """
+    # Ask for every hexadecimal digit to be zero so no candidate stops the
+    # search early.
+    start_time = time.perf_counter()
+    search(key_str, 32, 1, count + 1)
+    elapsed = time.perf_counter() - start_time
+
+    return count / elapsed
+
+
+if __name__ == "__main__":
+    # Read the input file, and process its contents.
+    input_file = open("input.txt", "r")
+    inputs = input_file.readlines()
+
+    count = 1000000
+
+    print("--- Candidates per second ---")
+    for i in inputs:
+        # Remove breakline.
+        key = i.strip()
+
+        before = measure_rate(search_range_reference, key, count)
+        after = measure_rate(search_range, key, count)
+
+        print(
+            "{}: before {:.0f}, after {:.0f} ({:.2f}x)".format(
+                key, before, after, after / before
+            )
+        )
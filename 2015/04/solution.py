@@ -26,7 +26,116 @@ Second Part:
 Now find one that starts with six zeroes.
 
 """
+import argparse
 import hashlib
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+
+# Amount of values that share the same leading digits during the search.
+BLOCK_SIZE = 1000
+
+# Decimal forms of the last three digits of a value, with and without the
+# leading zeroes.
+PADDED_SUFFIXES = [bytes("{:03d}".format(i), "utf-8") for i in range(BLOCK_SIZE)]
+SHORT_SUFFIXES = [bytes(str(i), "utf-8") for i in range(BLOCK_SIZE)]
+
+
+def get_digest_bound(k):
+    """Returns the bound under which a digest has k leading zeroes.
+
+    Parameters
+    ----------
+    k : int
+        The amount of leading zeroes the hash must have.
+
+    Returns
+    -------
+    bound : bytes or None
+        The 16 bytes such that a digest compares lower than them if and only if
+        its hexadecimal form starts with k zeroes, or None if every digest
+        does.
+    """
+    if k <= 0:
+        return None
+
+    # A digest read as a big-endian integer has k leading zero nibbles when it
+    # is lower than 16^(32 - k).
+    if k >= 32:
+        return bytes(15) + b"\x01"
+
+    return (16 ** (32 - k)).to_bytes(16, "big")
+
+
+def search_range(key_str, k, start, stop):
+    """Finds the lowest value in [start, stop) whose hash has k leading zeroes.
+
+    The hash of the key is computed once and copied for every value, the
+    values are built from precomputed decimal suffixes, and the zeroes are
+    checked on the raw digest instead of its hexadecimal form.
+
+    Parameters
+    ----------
+    key_str : str
+        The key string.
+
+    k : int
+        The amount of leading zeroes the hash must have.
+
+    start : int
+        The first value to check.
+
+    stop : int or None
+        The value where the search stops (not included), or None to search
+        without limit.
+
+    Returns
+    -------
+    value : int or None
+        The lowest value in the range that produces a hash with k leading
+        zeroes, or None if no value in the range does.
+    """
+    bound = get_digest_bound(k)
+
+    # If every hash is valid, the first value is the answer.
+    if bound is None:
+        return start if stop is None or start < stop else None
+
+    # Hash of the key, shared by every value.
+    key_hash = hashlib.md5(bytes(key_str, "utf-8"))
+
+    i = start
+    while stop is None or i < stop:
+        # Split the value into its leading digits and its last three digits.
+        high, low = divmod(i, BLOCK_SIZE)
+
+        # Check every value in the range that shares the leading digits.
+        last = BLOCK_SIZE
+        if stop is not None and stop < (high + 1) * BLOCK_SIZE:
+            last = stop - high * BLOCK_SIZE
+
+        # Hash the leading digits once for the whole block.
+        if high == 0:
+            block_hash = key_hash
+            suffixes = SHORT_SUFFIXES
+        else:
+            block_hash = key_hash.copy()
+            block_hash.update(bytes(str(high), "utf-8"))
+            suffixes = PADDED_SUFFIXES
+
+        for j in range(low, last):
+            h = block_hash.copy()
+            h.update(suffixes[j])
+
+            if h.digest() < bound:
+                return high * BLOCK_SIZE + j
+
+        i = (high + 1) * BLOCK_SIZE
+
+    return None
 
 
 def find_key_value(key_str, k):
@@ -47,48 +156,450 @@ def find_key_value(key_str, k):
         a hash with k leading zeroes.
     """
     # Traverse all the natural numbers to find the desired value.
-    i = 1
-    while True:
-        # Build the key with the value.
-        key = key_str + str(i)
-
-        # Get the MD5 hash of the key.
-        h = hashlib.md5(bytes(key, "utf-8")).hexdigest()
-
-        # Check if the first k bytes of the hash are zero.
-        are_zeros = True
-        for j in range(k):
-            are_zeros = are_zeros and h[j] == "0"
-
-        # If the first k bytes are zero, return the value, otherwise check
-        # for the next natural.
-        if are_zeros:
-            return i
+    return search_range(key_str, k, 1, None)
+
+
+def find_key_value_parallel(
+    key_str, k, workers=None, chunk_size=100000, start=1, stop=None, progress=None
+):
+    """Finds the value for which the hash has k leading zeroes using a pool of
+    processes.
+
+    The natural numbers are split into chunks of consecutive values that are
+    handed to the workers. The chunks are collected in order, so the value
+    returned is always the lowest one, even if a worker finds a valid value in
+    a later chunk first.
+
+    Parameters
+    ----------
+    key_str : str
+        The key string.
+
+    k : int
+        The amount of leading zeroes the hash must have.
+
+    workers : int or None
+        The amount of worker processes, or None to use every available core.
+
+    chunk_size : int
+        The amount of values each worker checks per task.
+
+    start : int
+        The first value to check.
+
+    stop : int or None
+        The value where the search stops (not included), or None to search
+        without limit.
+
+    progress : function or None
+        The function called with the last value scanned every time the lowest
+        chunk in flight finishes without a valid value, or None.
+
+    Returns
+    -------
+    value : int or None
+        The value that, when combined with the key and hashed with MD5, produces
+        a hash with k leading zeroes, or None if no value before stop does.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Chunks in flight, in the same order as the values they cover. Keep
+        # two chunks per worker so no worker waits for the next task.
+        pending = deque()
+        next_start = start
+
+        def submit_next():
+            """Hands out the next chunk, if any value is left before stop."""
+            nonlocal next_start
+
+            if stop is not None and next_start >= stop:
+                return
+
+            chunk_stop = next_start + chunk_size
+            if stop is not None:
+                chunk_stop = min(chunk_stop, stop)
+
+            future = pool.submit(search_range, key_str, k, next_start, chunk_stop)
+            pending.append((future, chunk_stop))
+            next_start = chunk_stop
+
+        for _ in range(2 * workers):
+            submit_next()
+
+        while pending:
+            # Wait for the lowest chunk; if it holds a value, no later chunk
+            # can hold a lower one.
+            future, chunk_stop = pending.popleft()
+            value = future.result()
+
+            if value is not None:
+                for future, _ in pending:
+                    future.cancel()
+
+                return value
+
+            # Otherwise, every value up to the end of the chunk was scanned, so
+            # report it and hand out the next chunk.
+            if progress is not None:
+                progress(chunk_stop - 1)
+
+            submit_next()
+
+    # Every value before stop was checked.
+    return None
+
+
+def load_checkpoint(path):
+    """Loads the searches saved on a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+
+    Returns
+    -------
+    checkpoint : dict
+        The checkpoint, with the last value scanned by each unfinished search
+        under "progress", and the value found by each finished search under
+        "solved". Both are indexed by the search id.
+    """
+    if not os.path.exists(path):
+        return {"progress": {}, "solved": {}}
+
+    with open(path, "r") as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def save_checkpoint(path, checkpoint):
+    """Saves the searches on a checkpoint file.
+
+    The file is written next to its destination and then moved over it, so an
+    interruption never leaves a partially written checkpoint.
+
+    Parameters
+    ----------
+    path : str
+        The path of the checkpoint file.
+
+    checkpoint : dict
+        The checkpoint, as returned by load_checkpoint.
+    """
+    temp_path = path + ".tmp"
+
+    with open(temp_path, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+
+    os.replace(temp_path, path)
+
+
+def find_key_value_checkpointed(
+    key_str, k, path, interval=1000000, workers=1, start=1
+):
+    """Finds the value for which the hash has k leading zeroes, saving the
+    progress of the search on a checkpoint file.
+
+    The last value scanned is saved every interval values, and a search that
+    was interrupted resumes from it. Once found, the value is saved as well and
+    returned right away on later calls. With several workers, a single pool is
+    kept for the whole search, saving the progress as its chunks finish in
+    order.
+
+    Parameters
+    ----------
+    key_str : str
+        The key string.
+
+    k : int
+        The amount of leading zeroes the hash must have.
+
+    path : str
+        The path of the checkpoint file.
+
+    interval : int
+        The amount of values scanned between saves.
+
+    workers : int
+        The amount of worker processes used by the search.
+
+    start : int
+        The first value to check.
+
+    Returns
+    -------
+    value : int
+        The value that, when combined with the key and hashed with MD5, produces
+        a hash with k leading zeroes.
+    """
+    checkpoint = load_checkpoint(path)
+
+    # Identify the search by its key and its amount of zeroes.
+    search_id = json.dumps([key_str, k])
+
+    if search_id in checkpoint["solved"]:
+        return checkpoint["solved"][search_id]
+
+    # Resume after the last value scanned, if any.
+    if search_id in checkpoint["progress"]:
+        start = max(start, checkpoint["progress"][search_id] + 1)
+
+    # Value after which the progress is saved next.
+    next_save = start + interval - 1
+
+    def save_progress(last):
+        """Saves the last value scanned, once per interval."""
+        nonlocal next_save
+
+        if last >= next_save:
+            checkpoint["progress"][search_id] = last
+            save_checkpoint(path, checkpoint)
+
+            next_save = last + interval
+
+    if workers > 1:
+        value = find_key_value_parallel(
+            key_str, k, workers, start=start, progress=save_progress
+        )
+    else:
+        # Scan an interval at a time, saving the progress after each one.
+        value = None
+        while value is None:
+            stop = start + interval
+            value = search_range(key_str, k, start, stop)
+
+            if value is None:
+                save_progress(stop - 1)
+                start = stop
+
+    checkpoint["progress"].pop(search_id, None)
+    checkpoint["solved"][search_id] = value
+    save_checkpoint(path, checkpoint)
+
+    return value
+
+
+def find_key_values(key_str, ks, workers=1, checkpoint=None):
+    """Finds the values for which the hash has k leading zeroes, for several k,
+    in a single scan.
+
+    The difficulties are solved from the lowest to the highest. A hash with
+    more leading zeroes also has fewer, so every difficulty resumes the scan
+    from the value that solved the previous one.
+
+    Parameters
+    ----------
+    key_str : str
+        The key string.
+
+    ks : iterable of int
+        The amounts of leading zeroes the hash must have.
+
+    workers : int
+        The amount of worker processes used by the search.
+
+    checkpoint : str or None
+        The path of the checkpoint file where the searches are saved, or None
+        to not save them.
+
+    Returns
+    -------
+    values : dict of int to int
+        The value found for each amount of leading zeroes.
+    """
+    values = {}
+
+    # Value where the scan continues.
+    start = 1
+
+    for k in sorted(set(ks)):
+        if checkpoint is not None:
+            value = find_key_value_checkpointed(
+                key_str, k, checkpoint, workers=workers, start=start
+            )
+        elif workers > 1:
+            value = find_key_value_parallel(key_str, k, workers, start=start)
         else:
-            i += 1
+            value = search_range(key_str, k, start, None)
+
+        values[k] = value
+
+        # The same value may also solve the next difficulty, so it is checked
+        # again.
+        start = value
+
+    return values
+
+
+def find_key_values_batch(keys, k, workers=None, chunk_size=100000, starts=None):
+    """Finds the value for which the hash has k leading zeroes for several keys
+    at the same time using a pool of processes.
+
+    The chunks of every unsolved key are handed out in turns to the workers, so
+    the pool stays busy until the last key is solved. Each key collects its own
+    chunks in order, so the value found for it is always the lowest one.
+
+    Parameters
+    ----------
+    keys : iterable of str
+        The key strings.
+
+    k : int
+        The amount of leading zeroes the hashes must have.
+
+    workers : int or None
+        The amount of worker processes, or None to use every available core.
+
+    chunk_size : int
+        The amount of values each worker checks per task.
+
+    starts : dict of str to int or None
+        The first value to check for each key, or None to start every key at 1.
+
+    Returns
+    -------
+    values : dict of str to int
+        The lowest value found for each key.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if starts is None:
+        starts = {}
+
+    # Next value to hand out and chunks in flight, in order, of each key.
+    next_starts = {key: starts.get(key, 1) for key in keys}
+    pending = {key: deque() for key in next_starts}
+
+    values = {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Unsolved keys, in the order they take turns.
+        turns = deque(next_starts)
+
+        def submit_chunks():
+            """Hands out chunks of the unsolved keys in turns, keeping two
+            chunks per worker in flight."""
+            # Finished chunks still waiting for an earlier chunk of their key
+            # do not keep any worker busy.
+            in_flight = sum(
+                not future.done() for chunks in pending.values() for future in chunks
+            )
+
+            while turns and in_flight < 2 * workers:
+                key = turns.popleft()
+                chunk_start = next_starts[key]
+
+                future = pool.submit(
+                    search_range, key, k, chunk_start, chunk_start + chunk_size
+                )
+                pending[key].append(future)
+                next_starts[key] = chunk_start + chunk_size
+                in_flight += 1
+
+                turns.append(key)
+
+        submit_chunks()
+
+        while turns:
+            # Wait for any chunk still running to finish.
+            running = [
+                future
+                for chunks in pending.values()
+                for future in chunks
+                if not future.done()
+            ]
+            wait(running, return_when=FIRST_COMPLETED)
+
+            for key in list(turns):
+                chunks = pending[key]
+
+                # Collect the finished chunks of the key in order; if one holds
+                # a value, no later chunk can hold a lower one.
+                while chunks and chunks[0].done():
+                    value = chunks.popleft().result()
+
+                    if value is not None:
+                        values[key] = value
+                        turns.remove(key)
+
+                        for future in chunks:
+                            future.cancel()
+                        chunks.clear()
+
+            submit_chunks()
+
+    return values
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Day 4: The Ideal Stocking Stuffer")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="amount of worker processes used by the search (default: 1)",
+    )
+
+    # The batch search does not save its progress, so it cannot be resumed.
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--checkpoint",
+        default=None,
+        help="file where the progress of the searches is saved and resumed from",
+    )
+    mode.add_argument(
+        "--batch",
+        action="store_true",
+        help="search every key at the same time with the worker processes",
+    )
+    args = parser.parse_args()
+
     # Read the input file, and process its contents.
     input_file = open("input.txt", "r")
     inputs = input_file.readlines()
 
-    print("--- First Part ---")
-    for i in inputs:
-        # Remove breakline.
-        key = i.strip()
+    # Remove breaklines.
+    keys = [i.strip() for i in inputs]
+
+    if args.batch:
+        # Determine the desired values of both parts for every key at once, the
+        # second part resuming from the first one.
+        start_time = time.perf_counter()
+        values_5 = find_key_values_batch(keys, 5, args.workers)
+        values_6 = find_key_values_batch(keys, 6, args.workers, starts=values_5)
+        elapsed = time.perf_counter() - start_time
+
+        # Every value up to the desired ones had to be hashed.
+        total = sum(values_6.values())
+        rate = total / elapsed if elapsed > 0 else float("inf")
+
+        print("--- First Part ---")
+        for key in keys:
+            print("Desired value:", values_5[key])
 
-        # Determine the desired value.
-        value = find_key_value(key, 5)
+        print("--- Second Part ---")
+        for key in keys:
+            print("Desired value:", values_6[key])
 
-        print("Desired value:", value)
+        print("Throughput: {:.0f} hashes/s".format(rate))
+    else:
+        # Determine the desired values of both parts with a single scan per key.
+        results = []
+        for key in keys:
+            start_time = time.perf_counter()
+            values = find_key_values(key, {5, 6}, args.workers, args.checkpoint)
+            elapsed = time.perf_counter() - start_time
 
-    print("--- Second Part ---")
-    for i in inputs:
-        # Remove breakline.
-        key = i.strip()
+            # Every value up to the last desired one had to be hashed.
+            rate = values[6] / elapsed if elapsed > 0 else float("inf")
+            results.append((values, rate))
 
-        # Determine the desired value.
-        value = find_key_value(key, 6)
+        print("--- First Part ---")
+        for values, _ in results:
+            print("Desired value:", values[5])
 
-        print("Desired value:", value)
+        print("--- Second Part ---")
+        for values, rate in results:
+            print("Desired value:", values[6], "({:.0f} hashes/s)".format(rate))
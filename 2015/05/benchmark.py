@@ -0,0 +1,151 @@
+"""Benchmarks for Day 5: Doesn't He Have Intern-Elves For This?
+
+Run from this directory with: python benchmark.py [--count N]
+
+"""
+import argparse
+import random
+import time
+
+from solution import (
+    FIRST_RULES,
+    SECOND_RULES,
+    compile_rules,
+    count_nice_batch,
+    count_nice_bytes,
+    count_nice_strings,
+    count_nice_strings_both,
+    is_nice_bytes_first_rules,
+    is_nice_bytes_second_rules,
+    is_nice_string_first_rules,
+    is_nice_string_second_rules,
+)
+
+
+def generate_strings(num_strings, length=16, seed=0):
+    """Generates random lowercase strings.
+
+    Parameters
+    ----------
+    num_strings : int
+        The amount of strings.
+
+    length : int
+        The length of each string.
+
+    seed : int
+        The seed of the random generator.
+
+    Returns
+    -------
+    strings : list of bytes
+        The strings.
+    """
+    rng = random.Random(seed)
+
+    # Turn each random byte into a lowercase letter.
+    letters = bytes.maketrans(
+        bytes(range(256)), (b"abcdefghijklmnopqrstuvwxyz" * 10)[:256]
+    )
+    data = rng.randbytes(num_strings * length).translate(letters)
+
+    return [data[i : i + length] for i in range(0, len(data), length)]
+
+
+def measure_rate(is_nice, strings):
+    """Measures how many strings per second a classifier checks.
+
+    Parameters
+    ----------
+    is_nice : function
+        The classifier.
+
+    strings : list
+        The strings to check.
+
+    Returns
+    -------
+    num_nice : int
+        The amount of nice strings.
+
+    rate : float
+        The amount of strings checked per second.
+    """
+    start_time = time.perf_counter()
+    num_nice = sum(map(is_nice, strings))
+    elapsed = time.perf_counter() - start_time
+
+    return num_nice, len(strings) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks for Day 5")
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=10000000,
+        help="amount of random strings (default: 10000000)",
+    )
+    args = parser.parse_args()
+
+    strings = generate_strings(args.count)
+    texts = [string.decode("ascii") for string in strings]
+
+    benchmarks = (
+        ("First rules", False, is_nice_string_first_rules, is_nice_bytes_first_rules),
+        ("Second rules", True, is_nice_string_second_rules, is_nice_bytes_second_rules),
+    )
+
+    for name, second_rule, current, compiled in benchmarks:
+        expected, before = measure_rate(current, texts)
+        num_nice, after = measure_rate(compiled, strings)
+
+        assert num_nice == expected
+
+        print("--- {} over {} strings ---".format(name, args.count))
+        print("Current: {:.0f} strings/s".format(before))
+        print("Compiled: {:.0f} strings/s ({:.2f}x)".format(after, after / before))
+
+        start_time = time.perf_counter()
+        num_nice = count_nice_batch(strings, second_rule)
+        batch = len(strings) / (time.perf_counter() - start_time)
+
+        assert num_nice == expected
+
+        print("Batch: {:.0f} strings/s ({:.2f}x)".format(batch, batch / before))
+
+        # The same rules in the rule language, compiled into a predicate.
+        rules = SECOND_RULES if second_rule else FIRST_RULES
+        num_nice, engine = measure_rate(compile_rules(rules, True), texts)
+
+        assert num_nice == expected
+
+        print("Rule engine: {:.0f} strings/s ({:.2f}x)".format(engine, engine / before))
+
+    # Compare checking both rules separately with checking them at once.
+    start_time = time.perf_counter()
+    expected = count_nice_strings(texts, False), count_nice_strings(texts, True)
+    before = time.perf_counter() - start_time
+
+    print("--- Both rules over {} strings ---".format(args.count))
+    print("Separate: {:.2f} s".format(before))
+
+    for name, count_nice in (
+        ("Bytes, separate", count_nice_bytes),
+        ("Batch, separate", count_nice_batch),
+    ):
+        start_time = time.perf_counter()
+        num_nice = count_nice(strings, False), count_nice(strings, True)
+        after = time.perf_counter() - start_time
+
+        assert num_nice == expected
+
+        print("{}: {:.2f} s ({:.2f}x)".format(name, after, before / after))
+
+    start_time = time.perf_counter()
+    num_nice = count_nice_strings_both(texts)
+    after = time.perf_counter() - start_time
+
+    assert num_nice == expected
+
+    print("Fused: {:.2f} s ({:.2f}x)".format(after, before / after))
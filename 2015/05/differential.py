@@ -0,0 +1,104 @@
+"""Differential checks for Day 5: Doesn't He Have Intern-Elves For This?
+
+Compares the second rules classifiers, including the compiled rules, against a
+brute-force reference on random strings. Run from this directory with:
+python differential.py [--count N]
+
+"""
+import argparse
+import random
+from functools import partial
+
+from solution import (
+    count_nice_batch,
+    is_nice_bytes_second_rules,
+    is_nice_compiled_second_rules,
+    is_nice_string_second_rules,
+)
+
+
+def is_nice_reference(s):
+    """Return whether a string is nice or not following the second rules, by
+    brute force.
+
+    Parameters
+    ----------
+    s : string
+        The string to check.
+
+    Returns
+    -------
+    is_nice : boolean
+        The boolean that indicates if the string is nice or not.
+    """
+    # Look for each pair again after its own end, so they do not overlap.
+    pairs = any(s[i : i + 2] in s[i + 2 :] for i in range(len(s) - 1))
+    between = any(s[i] == s[i + 2] for i in range(len(s) - 2))
+
+    return pairs and between
+
+
+def generate_strings(num_strings, rng):
+    """Generates random strings, mostly lowercase, with small alphabets and
+    lengths so repeated letters and pairs are common.
+
+    Parameters
+    ----------
+    num_strings : int
+        The amount of strings.
+
+    rng : random.Random
+        The random generator.
+
+    Returns
+    -------
+    strings : list of strings
+        The strings.
+    """
+    letters = "abcdefghijklmnopqrstuvwxyz"
+
+    # Mix in other characters, which take the general path.
+    alphabets = (letters[:1], letters[:2], letters[:3], letters, "aA1.", "ab\u00e9")
+
+    strings = []
+    for _ in range(num_strings):
+        alphabet = rng.choice(alphabets)
+        length = rng.choice((0, 1, 2, 3, 4, 5, 6, 16, 16))
+        strings.append("".join(rng.choices(alphabet, k=length)))
+
+    return strings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Differential checks for Day 5")
+    parser.add_argument(
+        "--count",
+        type=int,
+        default=2000000,
+        help="amount of random strings (default: 2000000)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args()
+
+    strings = generate_strings(args.count, random.Random(args.seed))
+    expected = list(map(is_nice_reference, strings))
+
+    # Encode the strings with one byte per character, so bytes pair the same.
+    to_bytes = partial(str.encode, encoding="latin-1")
+
+    # Check the classifiers one string at a time.
+    for name, is_nice, convert in (
+        ("is_nice_string_second_rules", is_nice_string_second_rules, str),
+        ("is_nice_bytes_second_rules", is_nice_bytes_second_rules, to_bytes),
+        ("is_nice_compiled_second_rules", is_nice_compiled_second_rules, str),
+    ):
+        for s, nice in zip(strings, expected):
+            if is_nice(convert(s)) != nice:
+                raise AssertionError("{} fails on {!r}".format(name, s))
+
+    # Check the batches on the whole list, as they classify many at once.
+    num_nice = count_nice_batch(list(map(to_bytes, strings)), True)
+    if num_nice != sum(expected):
+        raise AssertionError("count_nice_batch fails")
+
+    print("All {} strings match, {} nice".format(args.count, sum(expected)))
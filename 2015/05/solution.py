@@ -63,6 +63,46 @@ For example:
 
 How many strings are nice under these new rules?
 """
+import operator
+import threading
+from itertools import count
+
+# Byte that stands for "no previous character", past every real byte.
+NO_BYTE = 256
+
+# Whether each byte is a vowel.
+VOWEL_TABLE = bytes(1 if c in b"aeiou" else 0 for c in range(256))
+
+# The byte that may not follow each byte, or -1 if every byte may.
+FORBIDDEN_NEXT = [-1] * (NO_BYTE + 1)
+for pair in (b"ab", b"cd", b"pq", b"xy"):
+    FORBIDDEN_NEXT[pair[0]] = pair[1]
+
+# Step between the stamps of the checks that use the table of pairs, past the
+# position of any pair of a string.
+STAMP_STEP = 1 << 32
+
+# Bit of each rule in the masks of classify_string, in the order of the rules
+# in FIRST_RULES and SECOND_RULES.
+RULE_VOWELS = 1
+RULE_DOUBLE = 2
+RULE_ALLOWED = 4
+RULE_PAIRS = 8
+RULE_BETWEEN = 16
+
+# Rules that a nice string must pass following the first and second rules.
+FIRST_RULES_MASK = RULE_VOWELS | RULE_DOUBLE | RULE_ALLOWED
+SECOND_RULES_MASK = RULE_PAIRS | RULE_BETWEEN
+
+# The byte that may not follow each byte, or 0 if every byte may, as a
+# translation table for whole columns.
+FORBIDDEN_TABLE = bytes(max(FORBIDDEN_NEXT[c], 0) for c in range(256))
+
+# Amount of strings classified together, one byte lane per string.
+BATCH_SIZE = 65536
+
+# Longest strings classified together, so vowel counts fit in a byte lane.
+MAX_BATCH_LENGTH = 127
 
 
 def is_nice_string_first_rules(s):
@@ -119,44 +159,750 @@ def is_nice_string_second_rules(s):
     is_nice : boolean
         The boolean that indicates if the string is nice or not.
     """
-    # Get the length if the string.
-    n = len(s)
+    # ASCII strings are checked on their bytes with the table of pairs, and the
+    # rest with the rules compiled.
+    if s.isascii():
+        return is_nice_bytes_second_rules(s.encode("ascii"))
 
-    # Pairs of letters found on the string.
-    pairs = set()
+    return is_nice_compiled_second_rules(s)
 
-    # Boolean to check if the string has two pair of letters that repeat in the
-    # string and do not overlap.
-    first_condition = False
 
-    # Boolean to check if the string contains a letter which repeats with
-    # exactly one letter between them.
-    second_condition = False
+class PairTable(threading.local):
+    """Table of the position where each pair first appears in the string being
+    checked, reused by the checks of each thread.
 
-    # Traverse each character in the string in search of the conditions.
-    for i in range(n):
-        if i < n - 1:
-            # Temporal string to add it to the set of pairs.
-            temp = s[i] + s[i + 1]
+    Each entry holds the stamp of its check plus the position. Every check
+    takes a new stamp, so the entries of earlier checks are below it and the
+    table never needs to be cleared.
 
-            # If the pair was already in the set, then the first condition is
-            # true.
-            if temp in pairs:
-                first_condition = True
-            else:
-                pairs.add(temp)
+    Attributes
+    ----------
+    byte_pairs : list of int
+        The entry of each pair of bytes, indexed by 256 * first + second.
 
-        if i < n - 2:
-            # Check that the previous pair does not overlap.
-            if s[i] == s[i + 1] and s[i + 1] == s[i + 2]:
-                return False
+    stamps : iterator of int
+        The stamps of the next checks.
+    """
 
-            # Check for the second condition.
-            if s[i] == s[i + 2]:
-                second_condition = True
+    def __init__(self):
+        self.byte_pairs = [0] * (256 * 256)
+        self.stamps = count(STAMP_STEP, STAMP_STEP)
 
-    # Check that the string satisfies the conditions.
-    return first_condition and second_condition
+
+# The table of pairs, a separate instance in each thread.
+PAIR_TABLE = PairTable()
+
+
+def is_nice_bytes_first_rules(data):
+    """Return whether a string is nice or not following the first rules, in a
+    single pass over its bytes with precomputed tables.
+
+    Parameters
+    ----------
+    data : bytes
+        The string to check.
+
+    Returns
+    -------
+    is_nice : boolean
+        The boolean that indicates if the string is nice or not.
+    """
+    vowels = 0
+    twice = False
+
+    previous = NO_BYTE
+    for c in data:
+        vowels += VOWEL_TABLE[c]
+
+        if c == previous:
+            twice = True
+        elif FORBIDDEN_NEXT[previous] == c:
+            # Stop as soon as a forbidden pair is found.
+            return False
+
+        previous = c
+
+    return vowels >= 3 and twice
+
+
+def is_nice_bytes_second_rules(data):
+    """Return whether a string is nice or not following the second rules, in a
+    single pass over its bytes with precomputed tables.
+
+    Parameters
+    ----------
+    data : bytes
+        The string to check.
+
+    Returns
+    -------
+    is_nice : boolean
+        The boolean that indicates if the string is nice or not.
+    """
+    # Check for a byte which repeats with exactly one byte between them.
+    if not any(map(operator.eq, data, data[2:])):
+        return False
+
+    # Take a new stamp, so entries of previous strings in the table of pairs of
+    # the thread are below it.
+    stamp = next(PAIR_TABLE.stamps)
+    byte_pairs = PAIR_TABLE.byte_pairs
+
+    # The entry of each pair is the stamp plus the position where it starts.
+    position = stamp
+    previous = data[0] << 8
+
+    for c in data[1:]:
+        # Look up where the pair ending here first appeared.
+        pair = previous | c
+        entry = byte_pairs[pair]
+
+        if entry < stamp:
+            byte_pairs[pair] = position
+        elif position - entry >= 2:
+            # The pair appeared before without overlapping.
+            return True
+
+        previous = c << 8
+        position += 1
+
+    return False
+
+
+def count_nice_bytes(ls, second_rule):
+    """Counts the number of nice strings in a list of bytes.
+
+    Parameters
+    ----------
+    ls : list of bytes
+        The list of strings.
+
+    second_rule : boolean
+        Boolean that indicates if the second rules must be followed.
+
+    Returns
+    -------
+    num_nice : int
+        the number of nice strings in the list.
+    """
+    if second_rule:
+        is_nice = is_nice_bytes_second_rules
+    else:
+        is_nice = is_nice_bytes_first_rules
+
+    # Remove the breaklines, and count the nice strings.
+    return sum(map(is_nice, map(bytes.strip, ls)))
+
+
+def get_zero_lanes(x, low, high):
+    """Finds the byte lanes of an integer that are zero.
+
+    Parameters
+    ----------
+    x : int
+        The integer, as a sequence of byte lanes.
+
+    low : int
+        The integer with every lane set to 0x7F.
+
+    high : int
+        The integer with every lane set to 0x80.
+
+    Returns
+    -------
+    zero : int
+        The integer with the high bit set on each lane of x that is zero.
+    """
+    # The high bit of a lane is set if any of its bits is set.
+    return ~(((x & low) + low) | x) & high
+
+
+def load_batch(data, length):
+    """Loads a batch of strings of the same length as columns.
+
+    Parameters
+    ----------
+    data : bytes
+        The lowercase strings, concatenated.
+
+    length : int
+        The length of each string.
+
+    Returns
+    -------
+    columns : list of bytes
+        The characters of all the strings at each position.
+
+    lanes : list of int
+        The columns as integers, with one byte lane per string.
+
+    low : int
+        The integer with every lane set to 0x7F.
+
+    high : int
+        The integer with every lane set to 0x80.
+    """
+    n = len(data) // length
+    low = int.from_bytes(b"\x7f" * n, "little")
+    high = low + int.from_bytes(b"\x01" * n, "little")
+
+    columns = [data[j::length] for j in range(length)]
+    lanes = [int.from_bytes(column, "little") for column in columns]
+
+    return columns, lanes, low, high
+
+
+def get_first_rule_lanes(columns, lanes, low, high):
+    """Checks the first rules on a batch of strings loaded as columns.
+
+    Parameters
+    ----------
+    columns, lanes, low, high
+        The batch, as returned by load_batch.
+
+    Returns
+    -------
+    vowels, double, allowed : int
+        The integers with the high bit set on the lane of each string with at
+        least three vowels, with a letter twice in a row, and without any
+        forbidden string.
+    """
+    # Count the vowels, adding 125 so lanes with three reach the high bit.
+    vowels = sum(
+        int.from_bytes(column.translate(VOWEL_TABLE), "little") for column in columns
+    )
+    vowels = (vowels + 125 * (high >> 7)) & high
+
+    double = 0
+    forbidden = 0
+    for j in range(len(lanes) - 1):
+        double |= get_zero_lanes(lanes[j] ^ lanes[j + 1], low, high)
+
+        follower = columns[j].translate(FORBIDDEN_TABLE)
+        follower = int.from_bytes(follower, "little")
+        forbidden |= get_zero_lanes(follower ^ lanes[j + 1], low, high)
+
+    return vowels, double, ~forbidden & high
+
+
+def get_second_rule_lanes(lanes, low, high):
+    """Checks the second rules on a batch of strings loaded as columns.
+
+    Parameters
+    ----------
+    lanes, low, high
+        The batch, as returned by load_batch.
+
+    Returns
+    -------
+    pairs, between : int
+        The integers with the high bit set on the lane of each string with a
+        pair that appears twice without overlapping, and with a letter which
+        repeats with exactly one letter between them.
+    """
+    length = len(lanes)
+
+    # Compare the positions a fixed offset apart at a time, so only the lanes of
+    # one offset are kept.
+    between = 0
+    pairs = 0
+    for offset in range(2, length):
+        equal = [
+            get_zero_lanes(lanes[i] ^ lanes[i + offset], low, high)
+            for i in range(length - offset)
+        ]
+
+        # Letters that repeat with exactly one letter between them.
+        if offset == 2:
+            for lane in equal:
+                between |= lane
+
+        # Pairs that appear twice without overlapping.
+        for i in range(length - offset - 1):
+            pairs |= equal[i] & equal[i + 1]
+
+    return pairs, between
+
+
+def classify_batch(data, length, second_rule):
+    """Classifies a batch of strings of the same length at once.
+
+    Each position of the strings is loaded as a column, an integer with one
+    byte lane per string, so every rule is checked on all the strings with a
+    few whole-column operations.
+
+    Parameters
+    ----------
+    data : bytes
+        The lowercase strings, concatenated.
+
+    length : int
+        The length of each string, at most MAX_BATCH_LENGTH.
+
+    second_rule : boolean
+        Boolean that indicates if the second rules must be followed.
+
+    Returns
+    -------
+    nice : int
+        The integer with the high bit set on the lane of each nice string.
+    """
+    columns, lanes, low, high = load_batch(data, length)
+
+    if second_rule:
+        pairs, between = get_second_rule_lanes(lanes, low, high)
+        return pairs & between
+
+    vowels, double, allowed = get_first_rule_lanes(columns, lanes, low, high)
+    return vowels & double & allowed
+
+
+def classify_batch_both(data, length):
+    """Classifies a batch of strings of the same length following the first and
+    the second rules, loading the columns once.
+
+    Parameters
+    ----------
+    data : bytes
+        The lowercase strings, concatenated.
+
+    length : int
+        The length of each string, at most MAX_BATCH_LENGTH.
+
+    Returns
+    -------
+    first : int
+        The integer with the high bit set on the lane of each nice string
+        following the first rules.
+
+    second : int
+        The integer with the high bit set on the lane of each nice string
+        following the second rules.
+
+    rules : bytes
+        The mask of the rules passed by each string, as returned by
+        classify_string.
+    """
+    columns, lanes, low, high = load_batch(data, length)
+
+    vowels, double, allowed = get_first_rule_lanes(columns, lanes, low, high)
+    pairs, between = get_second_rule_lanes(lanes, low, high)
+
+    # Move the high bit of each rule to its bit in the mask of each lane.
+    rules = (vowels >> 7) | (double >> 6) | (allowed >> 5)
+    rules |= (pairs >> 4) | (between >> 3)
+
+    first = vowels & double & allowed
+    second = pairs & between
+
+    return first, second, rules.to_bytes(len(data) // length, "little")
+
+
+def count_nice_batch(ls, second_rule):
+    """Counts the number of nice strings in a list of bytes, classifying the
+    strings of the same length in batches and the rest one at a time.
+
+    Parameters
+    ----------
+    ls : list of bytes
+        The list of strings.
+
+    second_rule : boolean
+        Boolean that indicates if the second rules must be followed.
+
+    Returns
+    -------
+    num_nice : int
+        the number of nice strings in the list.
+    """
+    if second_rule:
+        is_nice = is_nice_bytes_second_rules
+    else:
+        is_nice = is_nice_bytes_first_rules
+
+    num_nice = 0
+
+    # Group the lowercase strings by length, and check the rest directly.
+    groups = {}
+    for s in map(bytes.strip, ls):
+        if s.isalpha() and s.islower() and len(s) <= MAX_BATCH_LENGTH:
+            groups.setdefault(len(s), []).append(s)
+        elif is_nice(s):
+            num_nice += 1
+
+    for length, strings in groups.items():
+        for start in range(0, len(strings), BATCH_SIZE):
+            data = b"".join(strings[start : start + BATCH_SIZE])
+            num_nice += classify_batch(data, length, second_rule).bit_count()
+
+    return num_nice
+
+
+def count_nice_strings_both(ls, masks=None):
+    """Counts the number of nice strings in a list following the first and the
+    second rules, checking each string once.
+
+    The lowercase strings of the same length are classified in batches, and
+    the rest one at a time.
+
+    Parameters
+    ----------
+    ls : list of strings
+        The list of strings.
+
+    masks : list, optional
+        The list where the mask of the rules passed by each string is appended,
+        as returned by classify_string.
+
+    Returns
+    -------
+    num_first : int
+        the number of nice strings following the first rules.
+
+    num_second : int
+        the number of nice strings following the second rules.
+    """
+    num_first = 0
+    num_second = 0
+
+    # The mask of each string, if they are wanted.
+    rules = bytearray(len(ls)) if masks is not None else None
+
+    ls = list(map(str.strip, ls))
+    text = "".join(ls)
+    lengths = set(map(len, ls))
+
+    # When all the strings are lowercase and of the same length, as in the
+    # puzzle input, they form a single group without checking each one.
+    if (
+        len(lengths) == 1
+        and 0 < min(lengths) <= MAX_BATCH_LENGTH
+        and text.isascii()
+        and text.isalpha()
+        and text.islower()
+    ):
+        groups = {len(ls[0]): (range(len(ls)), ls)}
+        ls = ()
+    else:
+        groups = {}
+
+    # Otherwise group the lowercase strings by length, with their indices in
+    # the list, and check the rest directly.
+    for i, s in enumerate(ls):
+        if s.isascii() and s.isalpha() and s.islower() and len(s) <= MAX_BATCH_LENGTH:
+            indices, strings = groups.setdefault(len(s), ([], []))
+            indices.append(i)
+            strings.append(s)
+            continue
+
+        string_rules = classify_string(s)
+
+        if string_rules & FIRST_RULES_MASK == FIRST_RULES_MASK:
+            num_first += 1
+        if string_rules & SECOND_RULES_MASK == SECOND_RULES_MASK:
+            num_second += 1
+
+        if rules is not None:
+            rules[i] = string_rules
+
+    for length, (indices, strings) in groups.items():
+        for start in range(0, len(strings), BATCH_SIZE):
+            data = "".join(strings[start : start + BATCH_SIZE]).encode("ascii")
+            first, second, batch_rules = classify_batch_both(data, length)
+
+            num_first += first.bit_count()
+            num_second += second.bit_count()
+
+            if rules is not None:
+                for i, string_rules in zip(indices[start:], batch_rules):
+                    rules[i] = string_rules
+
+    if masks is not None:
+        masks.extend(rules)
+
+    return num_first, num_second
+
+
+def pack_characters(s):
+    """Packs the character codes of a string into an integer, 21 bits each.
+
+    Parameters
+    ----------
+    s : string
+        The string to pack.
+
+    Returns
+    -------
+    key : int
+        The integer with the code of the last character in the lowest bits.
+    """
+    key = 0
+    for c in s:
+        key = key << 21 | ord(c)
+
+    return key
+
+
+class CharClassCount:
+    """Rule that a string contains at least a number of characters from a
+    class, like three vowels.
+
+    Parameters
+    ----------
+    characters : string
+        The characters of the class.
+
+    minimum : int
+        The least amount of characters of the class.
+    """
+
+    def __init__(self, characters, minimum):
+        if not isinstance(characters, str):
+            raise TypeError("The characters must be a string")
+
+        # The minimum is formatted into the compiled code, so only integers pass.
+        minimum = operator.index(minimum)
+        if minimum < 0:
+            raise ValueError("The minimum can not be negative")
+
+        self.characters = characters
+        self.minimum = minimum
+        self.depth = 0
+        self.key_lengths = ()
+
+    def generate(self, name, bit, predicate, namespace):
+        """Generates the code of the rule for a compiled evaluator.
+
+        Parameters
+        ----------
+        name : string
+            The name that prefixes the variables of the rule.
+
+        bit : int
+            The bit of the rule in the mask.
+
+        predicate : boolean
+            Boolean that indicates if the evaluator returns a boolean.
+
+        namespace : dict
+            The namespace of the evaluator, where the constants are added.
+
+        Returns
+        -------
+        setup, loop, final : list of strings
+            The lines to run before, for each character and after the scan.
+        """
+        namespace[name] = frozenset(map(ord, self.characters))
+
+        setup = ["{}_count = 0".format(name)]
+        loop = ["if c in {0}:".format(name), "    {}_count += 1".format(name)]
+        final = [
+            "if {}_count >= {}:".format(name, self.minimum),
+            "    mask |= {}".format(bit),
+        ]
+
+        return setup, loop, final
+
+
+class RepeatWithGap:
+    """Rule that a character appears again with exactly a number of characters
+    between them, like xx with a gap of 0 or xyx with a gap of 1.
+
+    Parameters
+    ----------
+    gap : int
+        The amount of characters between the two.
+    """
+
+    def __init__(self, gap):
+        gap = operator.index(gap)
+        if gap < 0:
+            raise ValueError("The gap can not be negative")
+
+        self.gap = gap
+        self.depth = gap + 1
+        self.key_lengths = ()
+
+    def generate(self, name, bit, predicate, namespace):
+        """Generates the code of the rule for a compiled evaluator.
+
+        See CharClassCount.generate.
+        """
+        loop = ["if c == c{}:".format(self.depth), "    mask |= {}".format(bit)]
+
+        return [], loop, []
+
+
+class ForbiddenSubstrings:
+    """Rule that a string does not contain any of a set of substrings.
+
+    Parameters
+    ----------
+    substrings : iterable of strings
+        The forbidden substrings, not empty.
+    """
+
+    def __init__(self, substrings):
+        self.substrings = tuple(substrings)
+        if not all(isinstance(s, str) for s in self.substrings):
+            raise TypeError("Forbidden substrings must be strings")
+        if not all(self.substrings):
+            raise ValueError("Forbidden substrings can not be empty")
+
+        self.key_lengths = tuple(sorted(set(map(len, self.substrings))))
+        self.depth = self.key_lengths[-1] - 1 if self.key_lengths else 0
+
+    def generate(self, name, bit, predicate, namespace):
+        """Generates the code of the rule for a compiled evaluator.
+
+        See CharClassCount.generate.
+        """
+        # A forbidden substring ends the check of the predicate right away.
+        if predicate:
+            action = "    return False"
+        else:
+            action = "    mask &= ~{}".format(bit)
+
+        # Look up the substrings of each length ending at each character.
+        loop = []
+        for length in self.key_lengths:
+            keys = "{}_{}".format(name, length)
+            namespace[keys] = frozenset(
+                pack_characters(s) for s in self.substrings if len(s) == length
+            )
+            loop += ["if key{} in {}:".format(length, keys), action]
+
+        return ["mask |= {}".format(bit)], loop, []
+
+
+class RepeatedKgram:
+    """Rule that a substring of a length appears at least twice without
+    overlapping, like xy in xyxy.
+
+    Parameters
+    ----------
+    length : int
+        The length of the substring.
+    """
+
+    def __init__(self, length):
+        length = operator.index(length)
+        if length < 1:
+            raise ValueError("The length must be at least 1")
+
+        self.length = length
+        self.depth = length - 1
+        self.key_lengths = (length,)
+
+    def generate(self, name, bit, predicate, namespace):
+        """Generates the code of the rule for a compiled evaluator.
+
+        See CharClassCount.generate.
+        """
+        # Keep the position where each substring first starts, and compare it
+        # with where it starts again.
+        setup = ["{}_first = {{}}".format(name)]
+        loop = [
+            "if i - {}_first.setdefault(key{}, i) >= {}:".format(
+                name, self.length, self.length
+            ),
+            "    mask |= {}".format(bit),
+        ]
+
+        return setup, loop, []
+
+
+def compile_rules(rules, predicate=False):
+    """Compiles a list of rules into a function that checks all of them in a
+    single pass over a string.
+
+    The previous characters needed by any rule are kept in shared variables,
+    and the substrings are looked up as integers packed from their character
+    codes, shared by the rules that need the same length.
+
+    Parameters
+    ----------
+    rules : list of rules
+        The rules, like CharClassCount, RepeatWithGap, ForbiddenSubstrings or
+        RepeatedKgram.
+
+    predicate : boolean
+        Boolean that indicates if the function returns whether the string
+        passes all the rules, stopping at the first forbidden substring.
+
+    Returns
+    -------
+    evaluate : function
+        The function that takes a string and returns the mask with the bit
+        1 << i set if it passes the rule i, or the boolean.
+    """
+    namespace = {}
+    setup = ["mask = 0"]
+    loop = []
+    final = []
+
+    for i, rule in enumerate(rules):
+        rule_setup, rule_loop, rule_final = rule.generate(
+            "rule{}".format(i), 1 << i, predicate, namespace
+        )
+        setup += rule_setup
+        loop += rule_loop
+        final += rule_final
+
+    # The previous characters, c1 being the one before the current.
+    depth = max((rule.depth for rule in rules), default=0)
+    history = ["c{}".format(j) for j in range(1, depth + 1)]
+
+    # Pack the substrings ending at the current character, once per length.
+    keys = []
+    for length in sorted({n for rule in rules for n in rule.key_lengths}):
+        parts = ["c{} << {}".format(j, 21 * j) for j in range(length - 1, 0, -1)]
+        keys.append("key{} = {}".format(length, " | ".join(parts + ["c"])))
+
+    # Before the first characters there are none, marked by -1.
+    if history:
+        setup.append(" = ".join(history + ["-1"]))
+
+    if any(isinstance(rule, RepeatedKgram) for rule in rules):
+        header = "for i, c in enumerate(map(ord, s)):"
+    else:
+        header = "for c in map(ord, s):"
+
+    body = keys + loop
+    if history:
+        shifted = ["c"] + history[:-1]
+        body.append("{} = {}".format(", ".join(history), ", ".join(shifted)))
+
+    if predicate:
+        result = "return mask == {}".format((1 << len(rules)) - 1)
+    else:
+        result = "return mask"
+
+    lines = ["def evaluate(s):"]
+    lines += ["    " + line for line in setup]
+    lines.append("    " + header)
+    lines += ["        " + line for line in body or ["pass"]]
+    lines += ["    " + line for line in final]
+    lines.append("    " + result)
+
+    exec("\n".join(lines), namespace)
+
+    return namespace["evaluate"]
+
+
+# The rules of each part, in the rule language.
+FIRST_RULES = (
+    CharClassCount("aeiou", 3),
+    RepeatWithGap(0),
+    ForbiddenSubstrings(("ab", "cd", "pq", "xy")),
+)
+SECOND_RULES = (RepeatedKgram(2), RepeatWithGap(1))
+
+# The rules of both parts compiled into the masks of classify_string, and each
+# part into a predicate for strings of any characters.
+classify_string = compile_rules(FIRST_RULES + SECOND_RULES)
+is_nice_compiled_first_rules = compile_rules(FIRST_RULES, True)
+is_nice_compiled_second_rules = compile_rules(SECOND_RULES, True)
 
 
 def count_nice_strings(ls, second_rule):
@@ -175,6 +921,13 @@ def count_nice_strings(ls, second_rule):
     num_nice : int
         the number of nice strings in the list.
     """
+    # The first rules are checked by the compiled rules, which stop at the
+    # first forbidden string.
+    if second_rule:
+        is_nice = is_nice_string_second_rules
+    else:
+        is_nice = is_nice_compiled_first_rules
+
     # Counter for the number of nice strings.
     num_nice = 0
 
@@ -183,12 +936,8 @@ def count_nice_strings(ls, second_rule):
         # Remove the breakline.
         s = string.strip()
 
-        if second_rule:
-            if is_nice_string_second_rules(s):
-                num_nice += 1
-        else:
-            if is_nice_string_first_rules(s):
-                num_nice += 1
+        if is_nice(s):
+            num_nice += 1
 
     return num_nice
 
@@ -198,10 +947,11 @@ if __name__ == "__main__":
     input_file = open("input.txt", "r")
     inputs = input_file.readlines()
 
+    # Check both rules on each string at once.
+    num_first, num_second = count_nice_strings_both(inputs)
+
     print("--- First Part ---")
-    num_nice_strings = count_nice_strings(inputs, False)
-    print("Number of nice strings:", num_nice_strings)
+    print("Number of nice strings:", num_first)
 
     print("--- Second Part ---")
-    num_nice_strings = count_nice_strings(inputs, True)
-    print("Number of nice strings:", num_nice_strings)
+    print("Number of nice strings:", num_second)